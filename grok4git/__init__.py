@@ -22,10 +22,13 @@ except ImportError:
 __author__ = "Oliver Baumgart"
 __description__ = "AI-powered GitHub repository management tool"
 
-# Main modules
-from . import config
-from . import github_api
-from . import tools
-from . import chat
-
 __all__ = ["config", "github_api", "tools", "chat"]
+
+
+def __getattr__(name: str):
+    """Import main modules on first access so the CLI entry point stays light."""
+    if name in __all__:
+        import importlib
+
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -8,6 +8,8 @@ with enhanced terminal formatting, slash commands, and user experience improveme
 import json
 import logging
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional, Tuple
 
 from openai import OpenAI
@@ -24,8 +26,37 @@ from prompt_toolkit import PromptSession
 from prompt_toolkit.completion import Completer, Completion
 from prompt_toolkit.formatted_text import HTML
 
+# orjson is an optional, faster drop-in for decoding tool arguments and results
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
 logger = logging.getLogger(__name__)
 
+# Read-only tools; several calls to these in one model turn are run concurrently
+_CONCURRENT_TOOLS = frozenset(
+    {
+        "list_github_repos",
+        "search_github_repos",
+        "get_bulk_codebase_overview",
+        "get_bulk_file_content",
+        "get_file_content",
+        "list_repo_branches",
+        "list_directory_contents",
+        "get_repo_info",
+        "recursive_list_directory",
+        "get_commit_history",
+        "get_commit_details",
+        "get_commit_diff",
+        "compare_commits",
+        "compare_commits_batch",
+    }
+)
+
+# Upper bound on tool calls in flight at once
+_MAX_CONCURRENT_TOOLS = 8
+
 
 class SlashCommandCompleter(Completer):
     def __init__(self, commands):
@@ -61,6 +92,21 @@ class GrokChat:
         self._setup_system_message()
         logger.info("Grok chat interface initialized")
 
+    def _warm_up_connection(self) -> None:
+        """Open the xAI HTTPS connection in the background before the first request."""
+        # The warm-up is an extra authenticated API request, so it is opt-in
+        if not config.xai_connection_warmup:
+            return
+
+        def warm_up() -> None:
+            try:
+                # Cheap authenticated call; the pooled connection is reused afterwards
+                self.client.models.list()
+            except Exception as e:
+                logger.debug("xAI connection warm-up failed: %s", e)
+
+        threading.Thread(target=warm_up, name="xai-warmup", daemon=True).start()
+
     def _setup_system_message(self) -> None:
         """Setup the initial system message for the AI."""
         system_message = {
@@ -402,6 +448,7 @@ Use `/command` for controlling the CLI client:
             # Reload config
             from dotenv import load_dotenv
             load_dotenv(override=True)
+            config.reload_settings()
             
             # Confirm the change
             emoji = "🟢" if new_status else "🔴"
@@ -609,7 +656,7 @@ Use `/command` for controlling the CLI client:
         function_name = tool_call.function.name
 
         try:
-            function_args = json.loads(tool_call.function.arguments)
+            function_args = _json_loads(tool_call.function.arguments)
         except json.JSONDecodeError as e:
             error_msg = f"Error parsing tool arguments: {str(e)}"
             logger.error(error_msg)
@@ -620,6 +667,11 @@ Use `/command` for controlling the CLI client:
             logger.error(error_msg)
             return error_msg
 
+        if not isinstance(function_args, dict):
+            error_msg = f"Error executing {function_name}: arguments must be a JSON object"
+            logger.error(error_msg)
+            return error_msg
+
         # Check if this is a destructive operation that requires confirmation
         if function_name in ["delete_file", "create_repository"]:
             if not self._confirm_destructive_operation(function_name, function_args):
@@ -632,13 +684,9 @@ Use `/command` for controlling the CLI client:
             status_msg = f"[cyan]⚡ Executing {padded_function_name} ->"
             
             with Status(status_msg, console=self.console) as status:
-                function_to_call = TOOL_FUNCTIONS.get(function_name)
-                if function_to_call is None:
-                    return f"Error: Unknown function {function_name}"
-                if callable(function_to_call):
-                    result = function_to_call(**function_args)
-                else:
-                    return f"Error: {function_name} is not callable"
+                succeeded, result = self._call_tool(function_name, function_args)
+                if not succeeded:
+                    return result
 
                 # Extract meaningful info from result for compact display
                 result_summary = self._extract_tool_result_summary(function_name, result, function_args)
@@ -653,11 +701,6 @@ Use `/command` for controlling the CLI client:
             # Print the final line to make it persistent (after status context ends)
             self.console.print(f"[cyan]⚡ Executing {padded_function_name} -> {result_summary} ✅")
 
-            # Only log detailed info in debug mode
-            if logger.isEnabledFor(logging.DEBUG):
-                logger.info(f"Tool {function_name} executed successfully")
-                logger.debug(f"Tool result: {result}")
-
             return str(result)
 
         except Exception as e:
@@ -665,15 +708,86 @@ Use `/command` for controlling the CLI client:
             logger.error(error_msg)
             return error_msg
 
+    def _call_tool(self, function_name: str, function_args: Any) -> Tuple[bool, Any]:
+        """
+        Call a tool function, turning invalid calls and failures into error messages.
+
+        Returns:
+            (True, result) on success, or (False, error message) otherwise
+        """
+        function_to_call = TOOL_FUNCTIONS.get(function_name)
+        if function_to_call is None:
+            return False, f"Error: Unknown function {function_name}"
+        if not callable(function_to_call):
+            return False, f"Error: {function_name} is not callable"
+        if not isinstance(function_args, dict):
+            error_msg = f"Error executing {function_name}: arguments must be a JSON object"
+            logger.error(error_msg)
+            return False, error_msg
+
+        try:
+            result = function_to_call(**function_args)
+        except Exception as e:
+            error_msg = f"Error executing {function_name}: {str(e)}"
+            logger.error(error_msg)
+            return False, error_msg
+
+        # Only log detailed info in debug mode
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.info("Tool %s executed successfully", function_name)
+            logger.debug("Tool result: %s", result)
+
+        return True, result
+
+    def _execute_tool_calls(self, tool_calls) -> List[str]:
+        """Execute the tool calls of one model turn, in order of the calls."""
+        if len(tool_calls) > 1 and all(
+            tool_call.function.name in _CONCURRENT_TOOLS for tool_call in tool_calls
+        ):
+            try:
+                calls = [
+                    (tool_call.function.name, _json_loads(tool_call.function.arguments))
+                    for tool_call in tool_calls
+                ]
+            except json.JSONDecodeError:
+                calls = None
+            if calls is not None:
+                return self._execute_tools_concurrently(calls)
+
+        return [self._execute_tool(tool_call) for tool_call in tool_calls]
+
+    def _execute_tools_concurrently(self, calls: List[Tuple[str, Any]]) -> List[str]:
+        """Run independent read-only tool calls in parallel so their requests overlap."""
+        status_msg = f"[cyan]⚡ Executing {len(calls)} tools concurrently ->"
+        with Status(status_msg, console=self.console):
+            with ThreadPoolExecutor(max_workers=min(_MAX_CONCURRENT_TOOLS, len(calls))) as executor:
+                futures = [
+                    executor.submit(self._call_tool, function_name, function_args)
+                    for function_name, function_args in calls
+                ]
+
+        results = []
+        for (function_name, function_args), future in zip(calls, futures):
+            padded_function_name = f"{function_name}".ljust(25)
+            succeeded, result = future.result()
+            if not succeeded:
+                results.append(result)
+                continue
+
+            result_summary = self._extract_tool_result_summary(function_name, result, function_args)
+            self.console.print(f"[cyan]⚡ Executing {padded_function_name} -> {result_summary} ✅")
+            results.append(str(result))
+
+        return results
+
     def _extract_tool_result_summary(self, function_name: str, result: str, args: dict) -> str:
         """Extract a concise summary from tool execution results."""
         try:
             # Handle different tool types
             if function_name == "list_github_repos":
                 # Extract repository count
-                import json
                 try:
-                    repos = json.loads(result)
+                    repos = _json_loads(result)
                     return f"Found {len(repos)} repositories"
                 except:
                     return "Listed repositories"
@@ -688,8 +802,7 @@ Use `/command` for controlling the CLI client:
                 repo = args.get("repo", "")
                 path = args.get("path", "")
                 try:
-                    import json
-                    items = json.loads(result)
+                    items = _json_loads(result)
                     return f"Listed {len(items)} items in {repo}/{path}"
                 except:
                     return f"Listed directory {repo}/{path}"
@@ -698,8 +811,7 @@ Use `/command` for controlling the CLI client:
                 # Extract commit count
                 repo = args.get("repo", "repository")
                 try:
-                    import json
-                    commits = json.loads(result)
+                    commits = _json_loads(result)
                     return f"Got {len(commits)} commits from {repo}"
                 except:
                     return f"Got commit history for {repo}"
@@ -710,8 +822,7 @@ Use `/command` for controlling the CLI client:
                 action = args.get("action", "managed")
                 if action == "list":
                     try:
-                        import json
-                        issues = json.loads(result)
+                        issues = _json_loads(result)
                         return f"Found {len(issues)} issues in {repo}"
                     except:
                         return f"Listed issues in {repo}"
@@ -733,8 +844,7 @@ Use `/command` for controlling the CLI client:
                 # Extract search results
                 query = args.get("query", "")
                 try:
-                    import json
-                    results = json.loads(result)
+                    results = _json_loads(result)
                     return f"Found {len(results)} repos for '{query}'"
                 except:
                     return f"Searched for '{query}'"
@@ -810,8 +920,8 @@ Use `/command` for controlling the CLI client:
 
             # Handle tool calls
             if response_message.tool_calls:
-                for tool_call in response_message.tool_calls:
-                    result = self._execute_tool(tool_call)
+                results = self._execute_tool_calls(response_message.tool_calls)
+                for tool_call, result in zip(response_message.tool_calls, results):
                     self.messages.append(
                         {"role": "tool", "content": result, "tool_call_id": tool_call.id}
                     )
@@ -838,6 +948,7 @@ Use `/command` for controlling the CLI client:
 
     def run(self) -> None:
         """Run the main chat loop."""
+        self._warm_up_connection()
         self._display_welcome()
 
         while True:
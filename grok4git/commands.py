@@ -6,6 +6,7 @@ for the Cursor-style slash command system.
 """
 
 import logging
+from itertools import islice
 from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
@@ -20,7 +21,7 @@ class CommandCategory(Enum):
     SYSTEM = "⚙️  System"
 
 
-@dataclass
+@dataclass(frozen=True)
 class Command:
     """Represents a slash command."""
 
@@ -29,11 +30,7 @@ class Command:
     category: CommandCategory
     usage: str
     examples: List[str]
-    aliases: List[str] = None
-
-    def __post_init__(self):
-        if self.aliases is None:
-            self.aliases = []
+    aliases: Tuple[str, ...] = ()
 
 
 class CommandRegistry:
@@ -42,6 +39,8 @@ class CommandRegistry:
     def __init__(self):
         self.commands: Dict[str, Command] = {}
         self._register_commands()
+        # Names and aliases in suggestion order, so lookups need no per-call sort
+        self._sorted_names: Tuple[str, ...] = tuple(sorted(self.commands))
 
     def _register_commands(self):
         """Register all available commands."""
@@ -53,7 +52,7 @@ class CommandRegistry:
                 category=CommandCategory.SYSTEM,
                 usage="/help [command]",
                 examples=["/help", "/help model"],
-                aliases=["h", "?"],
+                aliases=("h", "?"),
             ),
             Command(
                 name="clear",
@@ -61,7 +60,7 @@ class CommandRegistry:
                 category=CommandCategory.SYSTEM,
                 usage="/clear",
                 examples=["/clear"],
-                aliases=["cls", "reset"],
+                aliases=("cls", "reset"),
             ),
             Command(
                 name="exit",
@@ -69,7 +68,7 @@ class CommandRegistry:
                 category=CommandCategory.SYSTEM,
                 usage="/exit",
                 examples=["/exit"],
-                aliases=["quit", "bye"],
+                aliases=("quit", "bye"),
             ),
             Command(
                 name="model",
@@ -77,7 +76,7 @@ class CommandRegistry:
                 category=CommandCategory.SYSTEM,
                 usage="/model <model_name>",
                 examples=["/model grok-4", "/model grok-4-0709"],
-                aliases=["switch-model"],
+                aliases=("switch-model",),
             ),
             Command(
                 name="peer-review-toggle",
@@ -85,7 +84,7 @@ class CommandRegistry:
                 category=CommandCategory.SYSTEM,
                 usage="/peer-review-toggle [enable|disable]",
                 examples=["/peer-review-toggle enable", "/peer-review-toggle disable", "/peer-review-toggle"],
-                aliases=["peer-toggle", "pr-review-toggle"],
+                aliases=("peer-toggle", "pr-review-toggle"),
             ),
             Command(
                 name="peer-review-status",
@@ -93,7 +92,7 @@ class CommandRegistry:
                 category=CommandCategory.SYSTEM,
                 usage="/peer-review-status",
                 examples=["/peer-review-status"],
-                aliases=["peer-status", "pr-review-status"],
+                aliases=("peer-status", "pr-review-status"),
             ),
             # Convenience Commands
             Command(
@@ -102,7 +101,7 @@ class CommandRegistry:
                 category=CommandCategory.REPO,
                 usage="/repos [type]",
                 examples=["/repos", "/repos private", "/repos public"],
-                aliases=["repositories"],
+                aliases=("repositories",),
             ),
         ]
 
@@ -134,13 +133,8 @@ class CommandRegistry:
     def find_similar_commands(self, name: str) -> List[str]:
         """Find similar command names for suggestions."""
         name_lower = name.lower()
-        similar = []
-
-        for cmd_name in self.commands.keys():
-            if name_lower in cmd_name or cmd_name.startswith(name_lower):
-                similar.append(cmd_name)
-
-        return sorted(similar)[:5]  # Return top 5 matches
+        matches = (cmd_name for cmd_name in self._sorted_names if name_lower in cmd_name)
+        return list(islice(matches, 5))  # Return top 5 matches
 
 
 class CommandParser:
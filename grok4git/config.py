@@ -7,22 +7,46 @@ and other settings for the application.
 
 import os
 import logging
+import logging.handlers
 import shutil
+from typing import Optional
 from dotenv import load_dotenv
 from rich.console import Console
 from rich.prompt import Prompt
 import sys
 
 # Configure logging
+# File output is buffered and only written when the buffer fills or an error is
+# logged; logging.shutdown() flushes whatever remains at interpreter exit.
+_LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+_log_file = logging.FileHandler("grok4git.log", delay=True)
+_log_file.setFormatter(logging.Formatter(_LOG_FORMAT))
 logging.basicConfig(
     level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[logging.StreamHandler(), logging.FileHandler("grok4git.log")],
+    format=_LOG_FORMAT,
+    handlers=[
+        logging.StreamHandler(),
+        logging.handlers.MemoryHandler(
+            capacity=1024, flushLevel=logging.ERROR, target=_log_file
+        ),
+    ],
 )
 
 logger = logging.getLogger(__name__)
 console = Console()
 
+_TRUTHY = frozenset({"true", "1", "yes", "on"})
+
+
+def _getint(name: str, default: str) -> int:
+    """Read an integer setting from the environment."""
+    return int(os.getenv(name, default))
+
+
+def _getbool(name: str, default: str) -> bool:
+    """Read a boolean setting from the environment."""
+    return os.getenv(name, default).lower() in _TRUTHY
+
 
 class Config:
     """Configuration class for Grok4Git application."""
@@ -30,10 +54,20 @@ class Config:
     def __init__(self):
         """Initialize configuration by loading environment variables."""
         load_dotenv()
+        self.reload_settings()
         # Only run interactive setup if not in testing/CI environment
         if not self._is_testing_environment():
             self._ensure_env_setup()
 
+    def reload_settings(self) -> None:
+        """Parse typed settings from the environment once, instead of on every access."""
+        self.max_file_size_mb: int = _getint("MAX_FILE_SIZE_MB", "1")
+        self.api_timeout: int = _getint("API_TIMEOUT", "30")
+        self.pr_peer_review_enabled: bool = _getbool("ENABLE_PR_PEER_REVIEW", "false")
+        self.max_review_iterations: int = _getint("MAX_REVIEW_ITERATIONS", "3")
+        self.pr_preflight_permission_check: bool = _getbool("PR_PREFLIGHT_PERMISSION_CHECK", "false")
+        self.xai_connection_warmup: bool = _getbool("XAI_CONNECTION_WARMUP", "false")
+
     def _is_testing_environment(self) -> bool:
         """Check if we're running in a testing environment."""
         return (
@@ -78,36 +112,16 @@ class Config:
         """Get log level from environment or use default."""
         return os.getenv("LOG_LEVEL", "INFO").upper()
 
-    @property
-    def max_file_size_mb(self) -> int:
-        """Get maximum file size in MB for processing."""
-        return int(os.getenv("MAX_FILE_SIZE_MB", "1"))
-
-    @property
-    def api_timeout(self) -> int:
-        """Get API timeout in seconds for GitHub API calls (not AI requests)."""
-        return int(os.getenv("API_TIMEOUT", "30"))
-
     @property
     def github_api_version(self) -> str:
         """Get GitHub API version."""
         return os.getenv("GITHUB_API_VERSION", "2022-11-28")
 
-    @property
-    def pr_peer_review_enabled(self) -> bool:
-        """Get whether peer review is enabled for pull requests."""
-        return os.getenv("ENABLE_PR_PEER_REVIEW", "false").lower() == "true"
-
     @property
     def peer_review_model(self) -> str:
         """Get the AI model to use for peer review (defaults to main model)."""
         return os.getenv("PEER_REVIEW_MODEL", self.model_name)
 
-    @property
-    def max_review_iterations(self) -> int:
-        """Get maximum number of review iterations allowed."""
-        return int(os.getenv("MAX_REVIEW_ITERATIONS", "3"))
-
     def _ensure_env_setup(self) -> None:
         """Ensure environment variables are set up, prompt user if missing."""
         # Check if .env exists, if not, check if .env.example exists and copy it
@@ -147,6 +161,7 @@ class Config:
 
         # Reload environment variables after potential .env creation
         load_dotenv(override=True)
+        self.reload_settings()
 
         # Validate required variables
         self._validate_required_vars()
@@ -222,6 +237,12 @@ PEER_REVIEW_MODEL={self.peer_review_model}
 
 # Optional: Maximum number of review iterations
 MAX_REVIEW_ITERATIONS={self.max_review_iterations}
+
+# Optional: Check push access before creating a pull request
+PR_PREFLIGHT_PERMISSION_CHECK={str(self.pr_preflight_permission_check).lower()}
+
+# Optional: Open the xAI connection with a models request when the chat starts
+XAI_CONNECTION_WARMUP={str(self.xai_connection_warmup).lower()}
 """
 
         with open(".env", "w") as f:
@@ -261,14 +282,20 @@ MAX_REVIEW_ITERATIONS={self.max_review_iterations}
             "X-GitHub-Api-Version": self.github_api_version,
         }
 
-    def setup_logging(self) -> None:
-        """Setup logging configuration."""
-        numeric_level = getattr(logging, self.log_level, None)
+    def setup_logging(self, level: Optional[str] = None) -> None:
+        """
+        Setup logging configuration.
+
+        Args:
+            level: Log level name to apply (defaults to the configured log level)
+        """
+        level = level.upper() if level else self.log_level
+        numeric_level = getattr(logging, level, None)
         if not isinstance(numeric_level, int):
-            raise ValueError(f"Invalid log level: {self.log_level}")
+            raise ValueError(f"Invalid log level: {level}")
 
         logging.getLogger().setLevel(numeric_level)
-        logger.info(f"Logging level set to {self.log_level}")
+        logger.info(f"Logging level set to {level}")
 
 
 # Global configuration instance (lazy initialization)
@@ -6,13 +6,151 @@ including session management and common utility functions.
 """
 
 import logging
+import re
+import threading
 import time
+from collections import OrderedDict
 import requests
-from typing import Optional, Dict, Any
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from urllib3.util.request import ACCEPT_ENCODING
+from typing import Optional, Dict, Any, Callable, Iterator, NamedTuple, Tuple
 from .config import config
 
 logger = logging.getLogger(__name__)
 
+# Maximum total body size of GET responses kept for conditional (ETag) requests
+_ETAG_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+# Maximum total body size of responses kept for content-addressed (immutable) resources
+_IMMUTABLE_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+# Commits, trees and blobs addressed by a full SHA, and comparisons between two
+# full SHAs, never change
+_IMMUTABLE_URL_RE = re.compile(
+    r"/(?:(?:git/(?:commits|trees|blobs)|commits)/[0-9a-f]{40}"
+    r"|compare/[0-9a-f]{40}\.\.\.[0-9a-f]{40})$"
+)
+
+_CacheKey = Tuple[str, Tuple[Tuple[str, Any], ...], Tuple[Tuple[str, str], ...]]
+
+
+# REST API root, resolved once at import
+_API_BASE = config.github_api_base_url.rstrip("/")
+
+# Shared prefix for every repository-scoped REST endpoint
+_REPO_PREFIX = _API_BASE + "/repos/"
+
+# GitHub Enterprise serves REST under /api/v3 and GraphQL under /api/graphql
+_GRAPHQL_URL = (_API_BASE[: -len("/v3")] if _API_BASE.endswith("/api/v3") else _API_BASE) + "/graphql"
+
+
+class _CachedResponse(NamedTuple):
+    """Body and metadata of a GET response, without the connection or raw stream."""
+
+    etag: Optional[str]
+    status_code: int
+    headers: Dict[str, str]
+    content: bytes
+    url: str
+
+    @classmethod
+    def from_response(cls, response: requests.Response) -> "_CachedResponse":
+        """Capture a response, reading its body."""
+        return cls(
+            response.headers.get("ETag"),
+            response.status_code,
+            dict(response.headers),
+            response.content,
+            response.url,
+        )
+
+    def to_response(self) -> requests.Response:
+        """Build a fresh Response carrying the cached body."""
+        response = requests.Response()
+        response.status_code = self.status_code
+        response.headers = CaseInsensitiveDict(self.headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = self.url
+        response._content = self.content
+        return response
+
+
+class _ByteBoundedCache:
+    """
+    LRU cache of response bodies that evicts the oldest entries past a byte budget.
+
+    Not thread-safe; callers hold GitHubAPI._etag_lock.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries: "OrderedDict[_CacheKey, _CachedResponse]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: _CacheKey) -> Optional[_CachedResponse]:
+        """Get an entry, marking it as most recently used."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: _CacheKey, entry: _CachedResponse) -> None:
+        """Store an entry; bodies larger than the whole budget are not kept."""
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.size -= len(old.content)
+        if len(entry.content) > self.max_bytes:
+            return
+        self._entries[key] = entry
+        self.size += len(entry.content)
+        while self.size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= len(evicted.content)
+
+
+def api_url(*parts: Any) -> str:
+    """
+    Build a REST API URL outside the repository scope.
+
+    Args:
+        *parts: Path segments, e.g. "user", "repos"
+
+    Returns:
+        Full API URL
+    """
+    return _API_BASE + "/" + "/".join(str(part) for part in parts)
+
+
+def repo_url(repo: str, *parts: Any) -> str:
+    """
+    Build a repository-scoped REST API URL.
+
+    Args:
+        repo: Repository name in format 'owner/repo'
+        *parts: Path segments appended after the repository, e.g. "contents", path
+
+    Returns:
+        Full API URL
+    """
+    if not parts:
+        return _REPO_PREFIX + repo
+    return _REPO_PREFIX + repo + "/" + "/".join(str(part) for part in parts)
+
+
+class GitHubHTTPError(requests.exceptions.HTTPError):
+    """HTTP error from the GitHub API carrying the response status code."""
+
+    def __init__(self, message: str, status_code: int, url: str, body: str = "", **kwargs: Any):
+        super().__init__(message, **kwargs)
+        self.status_code = status_code
+        self.url = url
+        self.body = body
+
 
 class GitHubAPI:
     """GitHub API wrapper with session management and utility functions."""
@@ -21,8 +159,21 @@ class GitHubAPI:
         """Initialize GitHub API client with session."""
         self.session = requests.Session()
         self.session.headers.update(config.get_github_headers())
+        # Advertise every encoding urllib3 can decode (br/zstd when their packages are
+        # installed) instead of requests' fixed "gzip, deflate"; diffs compress well
+        self.session.headers.update({"Accept-Encoding": ACCEPT_ENCODING})
+        # Keep connections alive and pooled so consecutive calls reuse TLS sessions
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
         # Store timeout for use in requests
         self.timeout = config.api_timeout
+        # GET response bodies by (url, params), revalidated with If-None-Match so
+        # that unchanged resources come back as bodiless 304s
+        self._etag_cache = _ByteBoundedCache(_ETAG_CACHE_MAX_BYTES)
+        self._etag_lock = threading.Lock()
+        # GET response bodies for SHA-addressed resources, served without any request
+        self._immutable_cache = _ByteBoundedCache(_IMMUTABLE_CACHE_MAX_BYTES)
         logger.info("GitHub API client initialized")
 
     def get_default_branch(self, repo: str) -> str:
@@ -38,14 +189,13 @@ class GitHubAPI:
         Raises:
             ValueError: If repository is not found or accessible
         """
-        url = f"{config.github_api_base_url}/repos/{repo}"
+        url = repo_url(repo)
 
         try:
-            response = self.session.get(url)
-            response.raise_for_status()
+            response = self.make_request("GET", url)
 
             default_branch = str(response.json().get("default_branch", "main"))
-            logger.debug(f"Default branch for {repo}: {default_branch}")
+            logger.debug("Default branch for %s: %s", repo, default_branch)
             return default_branch
 
         except requests.exceptions.RequestException as e:
@@ -60,6 +210,7 @@ class GitHubAPI:
         data: Optional[Dict[Any, Any]] = None,
         params: Optional[Dict[str, Any]] = None,
         max_retries: int = 3,
+        headers: Optional[Dict[str, str]] = None,
     ) -> requests.Response:
         """
         Make a generic HTTP request to GitHub API with retry logic.
@@ -70,6 +221,124 @@ class GitHubAPI:
             data: JSON data for POST/PATCH requests
             params: Query parameters
             max_retries: Maximum number of retry attempts for rate limits
+            headers: Extra request headers, e.g. an Accept media type; GET responses
+                are cached separately per header set
+
+        Returns:
+            Response object
+
+        Raises:
+            requests.exceptions.RequestException: For HTTP errors
+        """
+        if method.upper() != "GET":
+            return self._send_with_retry(
+                lambda: self.session.request(
+                    method=method,
+                    url=url,
+                    json=data,
+                    params=params,
+                    headers=headers,
+                    timeout=self.timeout,
+                ),
+                method,
+                url,
+                max_retries,
+            )
+
+        key = self._etag_key(url, params, headers)
+        immutable = _IMMUTABLE_URL_RE.search(url) is not None
+        if immutable:
+            with self._etag_lock:
+                cached = self._immutable_cache.get(key)
+            if cached is not None:
+                return cached.to_response()
+
+        def send(conditional: Dict[str, str]) -> requests.Response:
+            return self._send_with_retry(
+                lambda: self.session.request(
+                    method=method,
+                    url=url,
+                    json=data,
+                    params=params,
+                    headers={**(headers or {}), **conditional},
+                    timeout=self.timeout,
+                ),
+                method,
+                url,
+                max_retries,
+            )
+
+        conditional = self._conditional_headers(key)
+        resolved = self._resolve_conditional(key, send(conditional), conditional)
+        if resolved is None:
+            # The cached body was evicted while the request was in flight
+            resolved = send({})
+            self._resolve_conditional(key, resolved, {})
+        response = resolved
+
+        if immutable:
+            entry = _CachedResponse.from_response(response)
+            with self._etag_lock:
+                self._immutable_cache.put(key, entry)
+        return response
+
+    @staticmethod
+    def _etag_key(
+        url: str, params: Optional[Dict[str, Any]], headers: Optional[Dict[str, str]] = None
+    ) -> _CacheKey:
+        """Build the conditional request cache key for a GET request."""
+        return url, tuple(sorted((params or {}).items())), tuple(sorted((headers or {}).items()))
+
+    def _conditional_headers(self, key: _CacheKey) -> Dict[str, str]:
+        """Get the If-None-Match header for a previously seen GET request."""
+        with self._etag_lock:
+            cached = self._etag_cache.get(key)
+        return {"If-None-Match": cached.etag} if cached and cached.etag else {}
+
+    def _resolve_conditional(
+        self, key: _CacheKey, response: requests.Response, conditional: Dict[str, str]
+    ) -> Optional[requests.Response]:
+        """
+        Return the cached body on 304 Not Modified, otherwise remember the new ETag.
+
+        Args:
+            key: Conditional request cache key
+            response: Response to the (possibly conditional) GET request
+            conditional: Conditional headers the request was sent with
+
+        Returns:
+            Response whose body reflects the current resource, or None on a 304 whose
+            cached body is no longer available; the caller resends unconditionally
+        """
+        if response.status_code == 304 and "If-None-Match" in conditional:
+            with self._etag_lock:
+                cached = self._etag_cache.get(key)
+            if cached is not None and cached.etag == conditional.get("If-None-Match"):
+                logger.debug("Not modified, reusing cached response: %s", key[0])
+                return cached.to_response()
+            return None
+
+        if isinstance(response.headers.get("ETag"), str):
+            entry = _CachedResponse.from_response(response)
+            with self._etag_lock:
+                self._etag_cache.put(key, entry)
+        return response
+
+    def _send_with_retry(
+        self,
+        send: Callable[[], requests.Response],
+        method: str,
+        url: str,
+        max_retries: int = 3,
+    ) -> requests.Response:
+        """
+        Send a request with rate limit handling and retry logic.
+
+        Args:
+            send: Callable that performs a single HTTP round-trip
+            method: HTTP method, used for logging
+            url: Request URL, used for logging
+            max_retries: Maximum number of retry attempts for rate limits
 
         Returns:
             Response object
@@ -79,12 +348,12 @@ class GitHubAPI:
         """
         for attempt in range(max_retries + 1):
             try:
-                response = self.session.request(method=method, url=url, json=data, params=params, timeout=self.timeout)
+                response = send()
 
                 # Log rate limit information
                 if "x-ratelimit-remaining" in response.headers:
                     remaining = response.headers["x-ratelimit-remaining"]
-                    logger.debug(f"GitHub API rate limit remaining: {remaining}")
+                    logger.debug("GitHub API rate limit remaining: %s", remaining)
 
                     # Warn if rate limit is getting low
                     if int(remaining) < 100:
@@ -110,19 +379,52 @@ class GitHubAPI:
                         continue
                     else:
                         logger.error("Rate limit exceeded and max retries reached")
-                        raise
+                        raise GitHubHTTPError(
+                            str(e), response.status_code, url, response.text, response=response
+                        ) from e
                 else:
-                    logger.error(f"GitHub API request failed: {method} {url} - {str(e)}")
-                    raise
+                    logger.error("GitHub API request failed: %s %s - %s", method, url, e)
+                    raise GitHubHTTPError(
+                        str(e), response.status_code, url, response.text, response=response
+                    ) from e
             except requests.exceptions.RequestException as e:
-                logger.error(f"GitHub API request failed: {method} {url} - {str(e)}")
+                logger.error("GitHub API request failed: %s %s - %s", method, url, e)
                 raise
         
         # This should never be reached, but satisfies MyPy
         raise requests.exceptions.RequestException("Max retries exceeded")
 
+    def graphql(self, query: str, variables: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Run a GitHub GraphQL query.
+
+        Args:
+            query: GraphQL query document
+            variables: Query variables
+
+        Returns:
+            The "data" object of the response
+
+        Raises:
+            ValueError: If the response contains GraphQL errors
+        """
+        response = self.make_request(
+            "POST", _GRAPHQL_URL, data={"query": query, "variables": variables or {}}
+        )
+        payload = response.json()
+
+        if payload.get("errors"):
+            messages = "; ".join(error.get("message", str(error)) for error in payload["errors"])
+            raise ValueError(f"GraphQL query failed: {messages}")
+
+        return payload.get("data") or {}
+
     def get_paginated_results(
-        self, url: str, params: Optional[Dict[str, Any]] = None, max_pages: int = 100
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        max_pages: int = 100,
+        limit: Optional[int] = None,
     ) -> list:
         """
         Get all results from a paginated GitHub API endpoint.
@@ -131,57 +433,116 @@ class GitHubAPI:
             url: Base URL for the API endpoint
             params: Query parameters
             max_pages: Maximum number of pages to fetch
+            limit: Maximum number of items to return; None fetches every page
 
         Returns:
             List of all items from all pages
         """
-        all_items = []
+        all_items = list(self.iter_paginated_results(url, params, max_pages, limit))
+        logger.debug("Retrieved %s items", len(all_items))
+        return all_items
+
+    def iter_paginated_results(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        max_pages: int = 100,
+        limit: Optional[int] = None,
+    ) -> Iterator[Any]:
+        """
+        Yield results from a paginated GitHub API endpoint one page at a time.
+
+        Only the current page is held in memory, so callers that project a single
+        field can avoid materializing every item.
+
+        Args:
+            url: Base URL for the API endpoint
+            params: Query parameters
+            max_pages: Maximum number of pages to fetch
+            limit: Stop after this many items without requesting further pages;
+                None fetches every page
+
+        Yields:
+            Items from each page, in order
+        """
         page = 1
-        per_page = 100
+        per_page = 100 if limit is None else max(1, min(100, limit))
+        item_count = 0
+
+        if limit is not None and limit <= 0:
+            return
 
         if params is None:
             params = {}
 
         params["per_page"] = per_page
 
+        # Prepare the request once so session headers are merged a single time;
+        # only the URL (page parameter) changes between iterations.
+        prepared = self.session.prepare_request(requests.Request("GET", url))
+        # Session.send skips what Session.request adds from the environment (proxies,
+        # REQUESTS_CA_BUNDLE/CURL_CA_BUNDLE); every page goes to the same host
+        send_settings = self.session.merge_environment_settings(
+            prepared.url, {}, None, None, None
+        )
+
+        def send() -> requests.Response:
+            return self._send_with_retry(
+                lambda: self.session.send(prepared, timeout=self.timeout, **send_settings),
+                "GET",
+                url,
+            )
+
         while page <= max_pages:
             params["page"] = page
+            prepared.prepare_url(url, params)
+            key = self._etag_key(url, params)
+            conditional = self._conditional_headers(key)
+
+            prepared.headers.pop("If-None-Match", None)
+            prepared.headers.update(conditional)
 
             try:
-                response = self.make_request("GET", url, params=params)
-                items = response.json()
-
-                # Handle different response formats
-                if isinstance(items, dict) and "items" in items:
-                    # Search API format
-                    page_items = items["items"]
-                    total_count = items.get("total_count", 0)
-                else:
-                    # Regular API format
-                    page_items = items
-                    total_count = None
+                resolved = self._resolve_conditional(key, send(), conditional)
+                if resolved is None:
+                    # The cached page was evicted while the request was in flight
+                    prepared.headers.pop("If-None-Match", None)
+                    resolved = send()
+                    self._resolve_conditional(key, resolved, {})
+                items = resolved.json()
+            except requests.exceptions.RequestException as e:
+                logger.error("Error fetching page %s: %s", page, e)
+                return
 
-                if not page_items:
-                    break
+            # Handle different response formats
+            if isinstance(items, dict) and "items" in items:
+                # Search API format
+                page_items = items["items"]
+                total_count = items.get("total_count", 0)
+            else:
+                # Regular API format
+                page_items = items
+                total_count = None
 
-                all_items.extend(page_items)
+            if not page_items:
+                return
 
-                # Check if we've reached the end
-                if len(page_items) < per_page:
-                    break
+            if limit is not None and item_count + len(page_items) >= limit:
+                yield from page_items[: limit - item_count]
+                return
 
-                # For search API, check if we've got all results
-                if total_count is not None and len(all_items) >= total_count:
-                    break
+            yield from page_items
+            item_count += len(page_items)
 
-                page += 1
+            # Check if we've reached the end
+            if len(page_items) < per_page:
+                return
 
-            except requests.exceptions.RequestException as e:
-                logger.error(f"Error fetching page {page}: {str(e)}")
-                break
+            # For search API, check if we've got all results
+            if total_count is not None and item_count >= total_count:
+                return
 
-        logger.debug(f"Retrieved {len(all_items)} items from {page-1} pages")
-        return all_items
+            page += 1
 
     def get_file_content_raw(self, repo: str, path: str, branch: str) -> str:
         """
@@ -201,7 +562,7 @@ class GitHubAPI:
         raw_url = f"https://raw.githubusercontent.com/{repo}/{branch}/{path}"
 
         try:
-            response = self.session.get(raw_url)
+            response = self.session.get(raw_url, timeout=self.timeout)
             response.raise_for_status()
 
             # Try to decode as UTF-8
@@ -216,6 +577,59 @@ class GitHubAPI:
             logger.error(error_msg)
             raise ValueError(error_msg)
 
+    def get_file_content_range(
+        self, repo: str, path: str, branch: str, start: int, end: Optional[int] = None
+    ) -> str:
+        """
+        Get part of a file from GitHub's raw content URL using an HTTP Range request.
+
+        Args:
+            repo: Repository name in format 'owner/repo'
+            path: File path
+            branch: Branch name
+            start: First byte offset, or a negative number for the last -start bytes
+            end: Last byte offset (inclusive), or None to read to the end of the file
+
+        Returns:
+            Requested part of the file; a multi-byte character cut at either edge
+            is replaced rather than raising
+
+        Raises:
+            ValueError: If the range cannot be retrieved
+        """
+        raw_url = f"https://raw.githubusercontent.com/{repo}/{branch}/{path}"
+        if start < 0 or end is None:
+            byte_range = f"bytes={start}" if start < 0 else f"bytes={start}-"
+        else:
+            byte_range = f"bytes={start}-{end}"
+
+        try:
+            # A range of a gzip/br-encoded response would slice the compressed bytes, so
+            # ask for the identity encoding; stream so an ignored Range isn't downloaded
+            response = self.session.get(
+                raw_url,
+                headers={"Range": byte_range, "Accept-Encoding": "identity"},
+                timeout=self.timeout,
+                stream=True,
+            )
+            try:
+                response.raise_for_status()
+                if response.status_code != 206:
+                    error_msg = (
+                        f"Server ignored byte range {byte_range} for {raw_url} "
+                        f"(status {response.status_code})"
+                    )
+                    logger.error(error_msg)
+                    raise ValueError(error_msg)
+                return response.content.decode("utf-8", errors="replace")
+            finally:
+                response.close()
+
+        except requests.exceptions.RequestException as e:
+            error_msg = f"Error fetching raw file range {byte_range}: {str(e)}"
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+
     def close(self):
         """Close the session."""
         self.session.close()
@@ -6,21 +6,47 @@ before they are submitted to GitHub, enabling iterative improvement
 and higher code quality.
 """
 
+import difflib
+import hashlib
 import json
 import logging
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass, field
+from functools import cached_property
 from typing import Dict, List, Optional, Tuple, Any, NamedTuple
 from enum import Enum
 
-from openai import OpenAI
-from rich.console import Console
-from rich.panel import Panel
-from rich.markdown import Markdown
-
 from .config import config
 
+# orjson is an optional, faster drop-in for decoding tool arguments and reviews
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
 logger = logging.getLogger(__name__)
 
+# Read-only GitHub tools whose results can be reused within a single review session
+_CACHEABLE_TOOLS = frozenset({
+    "get_file_content",
+    "get_bulk_file_content",
+    "get_bulk_codebase_overview",
+    "list_directory_contents",
+    "recursive_list_directory",
+    "get_repo_info",
+    "get_commit_details",
+    "get_commit_diff",
+    "compare_commits",
+    "compare_commits_batch",
+})
+
+# Keyword patterns for guessing a decision from unparseable review text. Only the
+# start of the word is anchored so inflections like "changes" or "rejected" match.
+_MAJOR_REVISION_RE = re.compile(r"\b(?:reject|major|revision|significant)", re.IGNORECASE)
+_REQUEST_CHANGES_RE = re.compile(r"\b(?:change|improve|fix|should)", re.IGNORECASE)
+
 
 class ReviewDecision(Enum):
     """Possible decisions from peer review."""
@@ -29,6 +55,21 @@ class ReviewDecision(Enum):
     NEEDS_MAJOR_REVISION = "needs_major_revision"
 
 
+# (header, suggestions label, footer) for the agent message of each non-approving decision
+_MESSAGE_TEMPLATES: Dict[ReviewDecision, Tuple[str, str, str]] = {
+    ReviewDecision.REQUEST_CHANGES: (
+        "Peer review feedback (iteration {iteration}):\n\n",
+        "**Suggestions:**\n",
+        "\nPlease implement these changes and create an updated pull request.",
+    ),
+    ReviewDecision.NEEDS_MAJOR_REVISION: (
+        "Peer review identified major issues requiring significant revision:\n\n",
+        "**Critical Issues:**\n",
+        "\nThis PR cannot be submitted in its current state. Please address these fundamental issues.",
+    ),
+}
+
+
 @dataclass
 class PeerReviewResult:
     """Result of peer review process."""
@@ -43,23 +84,15 @@ class PeerReviewResult:
         if self.decision == ReviewDecision.APPROVE:
             return f"Pull request approved by peer review agent after {self.iteration_count} iteration(s). Proceeding with GitHub submission."
         
-        elif self.decision == ReviewDecision.REQUEST_CHANGES:
-            message = f"Peer review feedback (iteration {self.iteration_count}):\n\n"
-            message += f"**Feedback:** {self.feedback}\n\n"
-            message += "**Suggestions:**\n"
-            for i, suggestion in enumerate(self.suggestions, 1):
-                message += f"{i}. {suggestion}\n"
-            message += "\nPlease implement these changes and create an updated pull request."
-            return message
-        
-        elif self.decision == ReviewDecision.NEEDS_MAJOR_REVISION:
-            message = f"Peer review identified major issues requiring significant revision:\n\n"
-            message += f"**Feedback:** {self.feedback}\n\n"
-            message += "**Critical Issues:**\n"
-            for i, suggestion in enumerate(self.suggestions, 1):
-                message += f"{i}. {suggestion}\n"
-            message += "\nThis PR cannot be submitted in its current state. Please address these fundamental issues."
-            return message
+        header, label, footer = _MESSAGE_TEMPLATES[self.decision]
+        parts = [
+            header.format(iteration=self.iteration_count),
+            f"**Feedback:** {self.feedback}\n\n",
+            label,
+        ]
+        parts.extend(f"{i}. {suggestion}\n" for i, suggestion in enumerate(self.suggestions, start=1))
+        parts.append(footer)
+        return "".join(parts)
 
 
 @dataclass
@@ -79,6 +112,30 @@ class PeerReviewContext:
     review_history: List[Dict[str, Any]] = field(default_factory=list)
     final_decision: Optional[ReviewDecision] = None
     
+    def get_static_section(self) -> str:
+        """Get the review request header with the repository and PR details."""
+        return f"""
+Please review this pull request before submission to GitHub. You have access to GitHub tools to explore repository context.
+
+**Repository:** {self.repo}
+**PR Title:** {self.title}
+**PR Description:** {self.body}
+**Branch:** {self.branch_name} → {self.base_branch or 'main'}
+**Commit Message:** {self.commit_message}
+
+**Original User Request Context:**
+{self.user_request or 'No original request context provided'}
+
+**Files Changed:**
+"""
+    
+    def get_file_hashes(self) -> List[str]:
+        """Get a content hash for each changed file, in file order."""
+        return [
+            hashlib.blake2b(file_info['new_content'].encode(), digest_size=8).hexdigest()
+            for file_info in self.files
+        ]
+    
     def add_review_iteration(self, decision: ReviewDecision, feedback: str, suggestions: List[str]):
         """Add a review iteration to the history."""
         self.review_history.append({
@@ -90,92 +147,181 @@ class PeerReviewContext:
         })
         self.current_iteration += 1
     
-    def _get_timestamp(self) -> str:
-        """Get current timestamp for review history."""
-        from datetime import datetime
-        return datetime.now().isoformat()
+    def _get_timestamp(self) -> int:
+        """Get current timestamp (nanoseconds since the epoch) for review history."""
+        return time.time_ns()
+
+
+# System prompt for the review agent, built once at import time
+_SYSTEM_MESSAGE: Dict[str, str] = {
+    "role": "system",
+    "content": (
+        "You are a Senior Code Review Agent specialized in thorough, constructive peer review. "
+        "You have access to GitHub tools to explore repository context and provide comprehensive reviews. "
+        "Your primary responsibility is to review pull requests before they are submitted to GitHub. "
+        "You work alongside another AI agent and provide a second pair of eyes to ensure code quality.\n\n"
+
+        "AVAILABLE TOOLS:\n"
+        "You have access to the same GitHub tools as the main agent, including:\n"
+        "- get_file_content: Read existing files to understand context\n"
+        "- list_directory_contents: Explore repository structure\n"
+        "- get_commit_history: Review recent changes\n"
+        "- get_repo_info: Understand repository metadata\n"
+        "- get_bulk_file_content: Read multiple files efficiently\n"
+        "- recursive_list_directory: Get full repository structure\n"
+        "Use these tools to understand the broader context before making review decisions.\n\n"
+
+        "REVIEW CRITERIA:\n"
+        "- Code Quality: Style, patterns, maintainability, readability\n"
+        "- Security: Potential vulnerabilities, secrets exposure, input validation\n"
+        "- Best Practices: Following conventions, error handling, performance\n"
+        "- Documentation: Comments, commit messages, PR descriptions\n"
+        "- Testing: Consider test coverage and edge cases\n"
+        "- Architecture: Design patterns, modularity, dependencies\n"
+        "- Context Awareness: How changes fit with existing codebase\n\n"
+
+        "REVIEW PROCESS:\n"
+        "1. Use tools to explore repository context if needed\n"
+        "2. Analyze all file changes thoroughly\n"
+        "3. Review commit message and PR description\n"
+        "4. Check for security issues and best practices\n"
+        "5. Consider how changes fit with existing code\n"
+        "6. Provide specific, actionable feedback\n"
+        "7. Make one of three decisions: APPROVE, REQUEST_CHANGES, or NEEDS_MAJOR_REVISION\n\n"
+
+        "FEEDBACK GUIDELINES:\n"
+        "- Be constructive and specific\n"
+        "- Reference line numbers when possible\n"
+        "- Explain the 'why' behind suggestions\n"
+        "- Prioritize critical issues over minor style preferences\n"
+        "- Acknowledge good practices when you see them\n"
+        "- Use repository context to make informed suggestions\n"
+        "- Keep feedback concise but comprehensive\n\n"
+
+        "DECISION CRITERIA:\n"
+        "- APPROVE: Code is ready for submission (minor suggestions are optional)\n"
+        "- REQUEST_CHANGES: Specific improvements needed but overall approach is good\n"
+        "- NEEDS_MAJOR_REVISION: Significant architectural or design issues require rework\n\n"
+
+        "Always provide your review in JSON format with: decision, feedback, suggestions, and reasoning.\n"
+        "Use the available tools to gather additional context when needed for thorough reviews."
+    )
+}
 
 
 class PeerReviewAgent:
     """AI agent specialized in code review with GitHub tool access."""
     
+    # Rough token budget for the review conversation and compaction settings
+    context_token_budget = 131072
+    compact_threshold = 0.8
+    keep_recent_messages = 3
+    
     def __init__(self):
         """Initialize the peer review agent."""
+        # Imported here so importing this module (e.g. via tools) stays cheap
+        from openai import OpenAI
+        from rich.console import Console
+        
         self.client = OpenAI(
             base_url=config.xai_base_url,
             api_key=config.xai_api_key
         )
+        self.console = Console()
         self.messages: List[Dict[str, Any]] = []
+        self._static_context_sent = False
+        # Results of read-only tool calls for this review session
+        self._tool_result_cache: Dict[Tuple[str, str], str] = {}
+        # File path -> content as of the last review, for diffing follow-up iterations
+        self._last_files_snapshot: Dict[str, str] = {}
+        # PR title, description, commit message and branch as of the last review
+        self._last_details_snapshot: Tuple[str, ...] = ()
         self._setup_system_message()
         logger.info("Enhanced peer review agent initialized with tool access")
     
     def _setup_system_message(self) -> None:
         """Setup specialized system message for code review."""
-        system_message = {
-            "role": "system",
-            "content": (
-                "You are a Senior Code Review Agent specialized in thorough, constructive peer review. "
-                "You have access to GitHub tools to explore repository context and provide comprehensive reviews. "
-                "Your primary responsibility is to review pull requests before they are submitted to GitHub. "
-                "You work alongside another AI agent and provide a second pair of eyes to ensure code quality.\n\n"
-                
-                "AVAILABLE TOOLS:\n"
-                "You have access to the same GitHub tools as the main agent, including:\n"
-                "- get_file_content: Read existing files to understand context\n"
-                "- list_directory_contents: Explore repository structure\n"
-                "- get_commit_history: Review recent changes\n"
-                "- get_repo_info: Understand repository metadata\n"
-                "- get_bulk_file_content: Read multiple files efficiently\n"
-                "- recursive_list_directory: Get full repository structure\n"
-                "Use these tools to understand the broader context before making review decisions.\n\n"
-                
-                "REVIEW CRITERIA:\n"
-                "- Code Quality: Style, patterns, maintainability, readability\n"
-                "- Security: Potential vulnerabilities, secrets exposure, input validation\n"
-                "- Best Practices: Following conventions, error handling, performance\n"
-                "- Documentation: Comments, commit messages, PR descriptions\n"
-                "- Testing: Consider test coverage and edge cases\n"
-                "- Architecture: Design patterns, modularity, dependencies\n"
-                "- Context Awareness: How changes fit with existing codebase\n\n"
-                
-                "REVIEW PROCESS:\n"
-                "1. Use tools to explore repository context if needed\n"
-                "2. Analyze all file changes thoroughly\n"
-                "3. Review commit message and PR description\n"
-                "4. Check for security issues and best practices\n"
-                "5. Consider how changes fit with existing code\n"
-                "6. Provide specific, actionable feedback\n"
-                "7. Make one of three decisions: APPROVE, REQUEST_CHANGES, or NEEDS_MAJOR_REVISION\n\n"
-                
-                "FEEDBACK GUIDELINES:\n"
-                "- Be constructive and specific\n"
-                "- Reference line numbers when possible\n"
-                "- Explain the 'why' behind suggestions\n"
-                "- Prioritize critical issues over minor style preferences\n"
-                "- Acknowledge good practices when you see them\n"
-                "- Use repository context to make informed suggestions\n"
-                "- Keep feedback concise but comprehensive\n\n"
-                
-                "DECISION CRITERIA:\n"
-                "- APPROVE: Code is ready for submission (minor suggestions are optional)\n"
-                "- REQUEST_CHANGES: Specific improvements needed but overall approach is good\n"
-                "- NEEDS_MAJOR_REVISION: Significant architectural or design issues require rework\n\n"
-                
-                "Always provide your review in JSON format with: decision, feedback, suggestions, and reasoning.\n"
-                "Use the available tools to gather additional context when needed for thorough reviews."
+        self.messages.append(dict(_SYSTEM_MESSAGE))
+    
+    def _estimate_tokens(self) -> int:
+        """Estimate the token count of the conversation (1 token ≈ 4 characters)."""
+        return sum(
+            len(message.get("content") or "") // 4
+            for message in self.messages
+        )
+    
+    def _compact_if_needed(self) -> bool:
+        """
+        Summarize older messages when the conversation nears the token budget.
+        
+        Returns:
+            True if older messages were replaced by a summary
+        """
+        if self._estimate_tokens() <= self.context_token_budget * self.compact_threshold:
+            return False
+        
+        # Keep the system message and the most recent messages; never start the kept
+        # tail on a tool result, since its assistant tool call would be summarized away
+        tail_start = len(self.messages) - self.keep_recent_messages
+        while tail_start > 1 and self.messages[tail_start]["role"] == "tool":
+            tail_start -= 1
+        if tail_start <= 1:
+            return False
+        
+        transcript = "\n\n".join(
+            f"{message['role']}: {message.get('content') or ''}"
+            for message in self.messages[1:tail_start]
+        )
+        try:
+            response = self.client.chat.completions.create(
+                model=config.peer_review_model,
+                messages=[
+                    {
+                        "role": "system",
+                        "content": "Summarize these review messages preserving all unresolved issues.",
+                    },
+                    {"role": "user", "content": transcript},
+                ],
+                temperature=0.3
             )
-        }
-        self.messages.append(system_message)
+            summary = response.choices[0].message.content
+        except Exception as e:
+            logger.warning("Could not compact peer review context: %s", e)
+            return False
+        
+        if not summary:
+            return False
+        
+        compacted = tail_start - 1
+        self.messages[1:tail_start] = [
+            {"role": "user", "content": f"Summary of the earlier review conversation:\n{summary}"}
+        ]
+        logger.info("Compacted %s peer review messages into a summary", compacted)
+        return True
     
     def review_pull_request(self, context: PeerReviewContext) -> Tuple[ReviewDecision, str, List[str]]:
         """Review a pull request with tool access for enhanced context."""
+        # Restored if the review fails, so a retry re-sends the whole request
+        saved_messages = list(self.messages)
         try:
             # Import tools here to avoid circular imports
             from .tools import TOOLS, TOOL_FUNCTIONS
             
-            # Prepare review request with enhanced context
-            review_request = self._format_review_request(context)
-            self.messages.append({"role": "user", "content": review_request})
+            # Send the repository and file context only once, so the conversation prefix
+            # stays identical across iterations and provider prompt caching can reuse it
+            # Follow-up iterations only carry what changed since the last review
+            if not self._static_context_sent:
+                self.messages.append({"role": "user", "content": self._format_static_context(context)})
+                updates = ""
+            else:
+                updates = self._format_detail_updates(context) + self._format_file_updates(context)
+            self.messages.append(
+                {"role": "user", "content": updates + self._format_iteration_delta(context)}
+            )
+            
+            # Tool results and earlier iterations grow the conversation, so check the
+            # budget before every completion
+            compacted = self._compact_if_needed()
             
             # Get review response with tool access
             response = self.client.chat.completions.create(
@@ -183,68 +329,103 @@ class PeerReviewAgent:
                 messages=self.messages,
                 tools=TOOLS,  # Give peer review agent access to the same tools
                 tool_choice="auto",
-                temperature=0.3  # Lower temperature for more consistent reviews
+                temperature=0.3,  # Lower temperature for more consistent reviews
+                response_format={"type": "json_object"}
             )
             
             response_message = response.choices[0].message
-            self.messages.append(response_message)
+            # Store a plain dict so the SDK doesn't re-serialize the model object on every request
+            assistant_message: Dict[str, Any] = {"role": "assistant", "content": response_message.content}
+            if response_message.tool_calls:
+                assistant_message["tool_calls"] = [
+                    {
+                        "id": tool_call.id,
+                        "type": "function",
+                        "function": {
+                            "name": tool_call.function.name,
+                            "arguments": tool_call.function.arguments,
+                        },
+                    }
+                    for tool_call in response_message.tool_calls
+                ]
+            self.messages.append(assistant_message)
             
             # Handle tool calls if the agent wants to explore the repository
             if response_message.tool_calls:
-                logger.info(f"Peer review agent is using {len(response_message.tool_calls)} tools for context")
+                logger.info(
+                    "Peer review agent is using %s tools for context",
+                    len(response_message.tool_calls),
+                )
+                
+                # Tool calls are independent GitHub round-trips, so run them concurrently
+                # and append the results in the order the model requested them. Identical
+                # read-only calls in the same batch run once and share the result.
+                tool_calls = response_message.tool_calls
+                call_keys = [self._tool_call_key(tool_call) for tool_call in tool_calls]
+                unique_calls = dict(zip(call_keys, tool_calls))
+                with ThreadPoolExecutor(max_workers=min(len(unique_calls), 8)) as executor:
+                    futures = {
+                        executor.submit(self._run_tool_call, tool_call, TOOL_FUNCTIONS): key
+                        for key, tool_call in unique_calls.items()
+                    }
+                    results = {futures[future]: future.result() for future in as_completed(futures)}
                 
-                for tool_call in response_message.tool_calls:
-                    try:
-                        tool_name = tool_call.function.name
-                        tool_args = json.loads(tool_call.function.arguments)
-                        
-                        if tool_name in TOOL_FUNCTIONS:
-                            result = TOOL_FUNCTIONS[tool_name](**tool_args)
-                            self.messages.append({
-                                "role": "tool",
-                                "content": result,
-                                "tool_call_id": tool_call.id
-                            })
-                            logger.info(f"Peer review agent used tool: {tool_name}")
-                        else:
-                            logger.warning(f"Unknown tool called by peer review agent: {tool_name}")
-                            self.messages.append({
-                                "role": "tool",
-                                "content": f"Error: Unknown tool {tool_name}",
-                                "tool_call_id": tool_call.id
-                            })
-                    except Exception as e:
-                        logger.error(f"Error executing tool {tool_call.function.name}: {str(e)}")
-                        self.messages.append({
-                            "role": "tool",
-                            "content": f"Error: {str(e)}",
-                            "tool_call_id": tool_call.id
-                        })
+                for tool_call, key in zip(tool_calls, call_keys):
+                    self.messages.append({
+                        "role": "tool",
+                        "content": results[key],
+                        "tool_call_id": tool_call.id
+                    })
                 
-                # Get final review after tool usage
-                final_response = self.client.chat.completions.create(
+                compacted = self._compact_if_needed() or compacted
+                
+                # Stream the final review after tool usage so progress shows as tokens arrive
+                stream = self.client.chat.completions.create(
                     model=config.peer_review_model,
                     messages=self.messages,
-                    temperature=0.3
+                    temperature=0.3,
+                    response_format={"type": "json_object"},
+                    stream=True
                 )
                 
-                final_response_message = final_response.choices[0].message
-                self.messages.append(final_response_message)
-                response_content = final_response_message.content
+                from rich.status import Status
+                
+                chunks: List[str] = []
+                with Status("[cyan]📝 Writing review...", console=self.console) as status:
+                    for chunk in stream:
+                        if chunk.choices and chunk.choices[0].delta.content:
+                            chunks.append(chunk.choices[0].delta.content)
+                            status.update(f"[cyan]📝 Writing review... ({len(chunks)} chunks received)")
+                
+                response_content = "".join(chunks)
+                self.messages.append({"role": "assistant", "content": response_content})
             else:
                 response_content = response_message.content
             
             if not response_content:
                 raise ValueError("No response content received from peer review agent")
             
+            # The model has answered this request, so later iterations can build on it,
+            # unless the file bodies may have been summarized away
+            self._static_context_sent = not compacted
+            if compacted:
+                self._last_files_snapshot.clear()
+                self._last_details_snapshot = ()
+            else:
+                self._last_files_snapshot = {
+                    file_info['file_path']: file_info['new_content'] for file_info in context.files
+                }
+                self._last_details_snapshot = self._pr_details(context)
+            
             # Parse the response
             decision, feedback, suggestions = self._parse_review_response(response_content)
             
-            logger.info(f"Enhanced peer review completed with decision: {decision.value}")
+            logger.info("Enhanced peer review completed with decision: %s", decision.value)
             return decision, feedback, suggestions
             
         except Exception as e:
-            logger.error(f"Error during enhanced peer review: {str(e)}")
+            logger.error("Error during enhanced peer review: %s", e)
+            self.messages = saved_messages
             # Fallback to approval on error to avoid blocking PR submission
             fallback_feedback = (
                 f"Enhanced peer review encountered an error and fell back to approval: {str(e)}\n\n"
@@ -260,29 +441,118 @@ class PeerReviewAgent:
                 "Verify all changes meet coding standards manually"
             ]
     
-    def _format_review_request(self, context: PeerReviewContext) -> str:
-        """Format the review request for the AI agent with enhanced context."""
+    @staticmethod
+    def _tool_call_key(tool_call: Any) -> Tuple[str, str]:
+        """Get the key under which identical read-only tool calls are run only once."""
+        tool_name = tool_call.function.name
+        if tool_name in _CACHEABLE_TOOLS:
+            return tool_name, tool_call.function.arguments
+        # Anything else may have side effects, so every call runs
+        return tool_name, tool_call.id
+    
+    def _run_tool_call(self, tool_call: Any, tool_functions: Dict[str, Any]) -> str:
+        """Execute a single tool call and return the content for its tool message."""
+        try:
+            tool_name = tool_call.function.name
+            tool_args = _json_loads(tool_call.function.arguments)
+            
+            tool_fn = tool_functions.get(tool_name)
+            if tool_fn is None:
+                logger.warning("Unknown tool called by peer review agent: %s", tool_name)
+                return f"Error: Unknown tool {tool_name}"
+            
+            # Read-only lookups are repeated often within one review; reuse their results
+            cache_key = None
+            if tool_name in _CACHEABLE_TOOLS:
+                cache_key = (tool_name, json.dumps(tool_args, sort_keys=True))
+                cached = self._tool_result_cache.get(cache_key)
+                if cached is not None:
+                    logger.info("Peer review agent reused cached result for tool: %s", tool_name)
+                    return cached
+            
+            result = tool_fn(**tool_args)
+            logger.info("Peer review agent used tool: %s", tool_name)
+            if cache_key is not None and not str(result).startswith("Error"):
+                self._tool_result_cache[cache_key] = result
+            return result
+        except Exception as e:
+            logger.error("Error executing tool %s: %s", tool_call.function.name, e)
+            return f"Error: {str(e)}"
+    
+    def _format_static_context(self, context: PeerReviewContext) -> str:
+        """Format the parts of the review request that stay fixed across iterations."""
         files_content = []
-        for file_info in context.files:
-            files_content.append(f"**File: {file_info['file_path']}**\n```\n{file_info['new_content']}\n```")
+        # Content hash -> first path with that content; copies point at it instead
+        first_paths: Dict[str, str] = {}
+        for file_info, content_hash in zip(context.files, context.get_file_hashes()):
+            file_path = file_info['file_path']
+            first_path = first_paths.setdefault(content_hash, file_path)
+            if first_path != file_path:
+                files_content.append(f"**File: {file_path}** (identical to `{first_path}`)")
+                continue
+            files_content.append(f"**File: {file_path}**\n```\n{file_info['new_content']}\n```")
         
         files_section = "\n\n".join(files_content)
         
-        review_request = f"""
-Please review this pull request before submission to GitHub. You have access to GitHub tools to explore repository context.
-
-**Repository:** {context.repo}
-**PR Title:** {context.title}
-**PR Description:** {context.body}
-**Branch:** {context.branch_name} → {context.base_branch or 'main'}
-**Commit Message:** {context.commit_message}
-
-**Original User Request Context:**
-{context.user_request or 'No original request context provided'}
-
-**Files Changed:**
-{files_section}
+        return f"{context.get_static_section()}{files_section}\n"
+    
+    @staticmethod
+    def _pr_details(context: PeerReviewContext) -> Tuple[str, ...]:
+        """Get the PR fields that a follow-up iteration may change, in display order."""
+        return (
+            context.title,
+            context.body,
+            f"{context.branch_name} → {context.base_branch or 'main'}",
+            context.commit_message,
+        )
+    
+    def _format_detail_updates(self, context: PeerReviewContext) -> str:
+        """Format the PR title, description, branch or commit message if they changed."""
+        labels = ("PR Title", "PR Description", "Branch", "Commit Message")
+        changed = [
+            f"**{label}:** {value}"
+            for label, value, previous in zip(
+                labels, self._pr_details(context), self._last_details_snapshot
+            )
+            if value != previous
+        ]
+        if not changed:
+            return ""
+        
+        return "\n**Updated PR Details:**\n" + "\n".join(changed) + "\n"
+    
+    def _format_file_updates(self, context: PeerReviewContext) -> str:
+        """Format diffs of the files that changed since the previous review iteration."""
+        updates = []
+        for file_info in context.files:
+            file_path = file_info['file_path']
+            new_content = file_info['new_content']
+            old_content = self._last_files_snapshot.get(file_path)
+            if old_content == new_content:
+                continue
+            if old_content is None:
+                updates.append(f"**File: {file_path}** (new)\n```\n{new_content}\n```")
+                continue
+            diff = "\n".join(difflib.unified_diff(
+                old_content.splitlines(), new_content.splitlines(),
+                fromfile=f"a/{file_path}", tofile=f"b/{file_path}", lineterm=""
+            ))
+            updates.append(f"**File: {file_path}**\n```diff\n{diff}\n```")
+        
+        if not updates:
+            return ""
+        
+        updates_section = "\n\n".join(updates)
+        return f"""
+**Updated Files:**
+Here are the changes since the previous iteration. Please re-review.
 
+{updates_section}
+"""
+    
+    def _format_iteration_delta(self, context: PeerReviewContext) -> str:
+        """Format the per-iteration part of the review request (history and instructions)."""
+        return f"""
 **Review History:**
 {self._format_review_history(context)}
 
@@ -300,36 +570,22 @@ Please provide your review in the following JSON format:
     "reasoning": "Explanation of your decision and any tool usage"
 }}
 """
-        return review_request
     
     def _format_review_history(self, context: PeerReviewContext) -> str:
         """Format the review history for context."""
         if not context.review_history:
             return "This is the first review iteration."
         
-        history_items = []
-        for review in context.review_history:
-            history_items.append(f"- Iteration {review['iteration']}: {review['decision']} - {review['feedback']}")
-        
-        return "\n".join(history_items)
+        return "\n".join(
+            f"- Iteration {review['iteration']}: {review['decision']} - {review['feedback']}"
+            for review in context.review_history
+        )
     
     def _parse_review_response(self, response_content: str) -> Tuple[ReviewDecision, str, List[str]]:
         """Parse the JSON response from the review agent."""
         try:
-            # Extract JSON from response (handle markdown code blocks)
-            if "```json" in response_content:
-                start = response_content.find("```json") + 7
-                end = response_content.find("```", start)
-                json_content = response_content[start:end].strip()
-            elif "```" in response_content:
-                start = response_content.find("```") + 3
-                end = response_content.find("```", start)
-                json_content = response_content[start:end].strip()
-            else:
-                json_content = response_content
-            
-            # Parse JSON
-            review_data = json.loads(json_content)
+            # Completions are requested with a JSON object response format
+            review_data = _json_loads(response_content)
             
             # Extract decision
             decision_str = review_data.get("decision", "approve").lower()
@@ -342,17 +598,17 @@ Please provide your review in the following JSON format:
             return decision, feedback, suggestions
             
         except (json.JSONDecodeError, ValueError, KeyError) as e:
-            logger.error(f"Failed to parse review response: {str(e)}")
-            logger.debug(f"Response content: {response_content}")
+            logger.error("Failed to parse review response: %s", e)
+            logger.debug("Response content: %s", response_content)
             
-            # Fallback parsing
+            # Fallback parsing for endpoints that ignore response_format
             feedback = "Review parsing failed, but content seems acceptable"
             suggestions = []
             
             # Try to determine decision from content
-            if any(word in response_content.lower() for word in ["reject", "major", "revision", "significant"]):
+            if _MAJOR_REVISION_RE.search(response_content):
                 decision = ReviewDecision.NEEDS_MAJOR_REVISION
-            elif any(word in response_content.lower() for word in ["change", "improve", "fix", "should"]):
+            elif _REQUEST_CHANGES_RE.search(response_content):
                 decision = ReviewDecision.REQUEST_CHANGES
             else:
                 decision = ReviewDecision.APPROVE
@@ -365,10 +621,16 @@ class PeerReviewOrchestrator:
     
     def __init__(self):
         """Initialize the peer review orchestrator."""
+        from rich.console import Console
+        
         self.console = Console()
-        self.peer_agent = PeerReviewAgent()
         logger.info("Peer review orchestrator initialized")
     
+    @cached_property
+    def peer_agent(self) -> PeerReviewAgent:
+        """Create the review agent (and its OpenAI client) on first use."""
+        return PeerReviewAgent()
+    
     def orchestrate_review(self, context: PeerReviewContext) -> PeerReviewResult:
         """
         Orchestrate the peer review process.
@@ -376,11 +638,24 @@ class PeerReviewOrchestrator:
         Returns:
             PeerReviewResult with decision, feedback, and suggestions
         """
+        # No review iterations configured: approve without touching the API or console
+        if config.max_review_iterations <= 0:
+            return PeerReviewResult(
+                decision=ReviewDecision.APPROVE,
+                feedback="Peer review disabled via config",
+                suggestions=[],
+                should_proceed=True,
+                iteration_count=0
+            )
+        
+        from rich.panel import Panel
+        
+        n_files = len(context.files)
         self.console.print(Panel(
             "[bold cyan]🔄 Peer Review Process Started[/bold cyan]\n"
             f"Repository: {context.repo}\n"
             f"PR Title: {context.title}\n"
-            f"Files: {len(context.files)} changed",
+            f"Files: {n_files} changed",
             title="Peer Review",
             border_style="cyan"
         ))
@@ -393,7 +668,7 @@ class PeerReviewOrchestrator:
                 decision, feedback, suggestions = self.peer_agent.review_pull_request(context)
                 context.add_review_iteration(decision, feedback, suggestions)
             except Exception as e:
-                logger.error(f"Peer review iteration failed: {str(e)}")
+                logger.error("Peer review iteration failed: %s", e)
                 self._display_review_error(str(e))
                 
                 # Ask user how to proceed on error
@@ -496,6 +771,8 @@ class PeerReviewOrchestrator:
     
     def _display_review_results(self, decision: ReviewDecision, feedback: str, suggestions: List[str]) -> None:
         """Display the review results."""
+        from rich.markdown import Markdown
+        
         # Decision with emoji
         decision_emoji = {
             ReviewDecision.APPROVE: "✅",
@@ -512,14 +789,17 @@ class PeerReviewOrchestrator:
         
         # Suggestions
         if suggestions:
-            self.console.print(f"[bold]💡 Suggestions:[/bold]")
-            for i, suggestion in enumerate(suggestions, 1):
-                self.console.print(f"  {i}. {suggestion}")
+            # Render the whole list in one print instead of one per suggestion
+            lines = ["[bold]💡 Suggestions:[/bold]"]
+            lines.extend(f"  {i}. {suggestion}" for i, suggestion in enumerate(suggestions, start=1))
+            self.console.print("\n".join(lines))
         
         self.console.print()  # Add spacing
     
     def _display_approval(self) -> None:
         """Display approval message."""
+        from rich.panel import Panel
+        
         self.console.print(Panel(
             "[bold green]✅ Pull Request Approved![/bold green]\n"
             "The peer review agent has approved the PR for submission to GitHub.",
@@ -529,6 +809,8 @@ class PeerReviewOrchestrator:
     
     def _display_major_revision_needed(self) -> None:
         """Display major revision needed message."""
+        from rich.panel import Panel
+        
         self.console.print(Panel(
             "[bold red]❌ Major Revision Required[/bold red]\n"
             "The peer review agent identified significant issues that require major changes.\n"
@@ -539,6 +821,8 @@ class PeerReviewOrchestrator:
     
     def _display_requesting_changes(self) -> None:
         """Display requesting changes message."""
+        from rich.panel import Panel
+        
         self.console.print(Panel(
             "[bold yellow]🔄 Changes Requested[/bold yellow]\n"
             "The peer review agent has requested specific changes.\n"
@@ -549,6 +833,8 @@ class PeerReviewOrchestrator:
     
     def _display_max_iterations_reached(self) -> None:
         """Display maximum iterations reached message."""
+        from rich.panel import Panel
+        
         self.console.print(Panel(
             "[bold yellow]⏰ Maximum Review Iterations Reached[/bold yellow]\n"
             f"Completed {config.max_review_iterations} review iterations.\n"
@@ -559,6 +845,8 @@ class PeerReviewOrchestrator:
     
     def _display_review_error(self, error_message: str) -> None:
         """Display review error message."""
+        from rich.panel import Panel
+        
         self.console.print(Panel(
             f"[bold red]❌ Peer Review Error[/bold red]\n"
             f"An error occurred during the peer review process:\n"
@@ -6,41 +6,154 @@ by the AI assistant to perform various GitHub operations.
 """
 
 import base64
+import codecs
+import functools
+import hashlib
 import json
 import logging
-import urllib.parse
-from typing import Dict, List, Any, Optional
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import replace
+from typing import Dict, List, Any, Optional, Tuple
 
 from .config import config
-from .github_api import github_api
-from .peer_review import create_peer_review_context, PeerReviewOrchestrator, PeerReviewResult
+from .github_api import GitHubHTTPError, api_url, github_api, repo_url
+from .peer_review import (
+    create_peer_review_context,
+    PeerReviewContext,
+    PeerReviewOrchestrator,
+    PeerReviewResult,
+    ReviewDecision,
+)
+
+# orjson is an optional, faster drop-in for parsing API responses and encoding tool results
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode("utf-8")
+
+except ImportError:
+    _json_loads = json.loads
+    _json_dumps = json.dumps
 
 logger = logging.getLogger(__name__)
 # Set tools logger to WARNING level by default to reduce clutter unless in debug mode
 if config.log_level != "DEBUG":
     logger.setLevel(logging.WARNING)
 
+# Bytes fetched from each end of a file that is too large to read in full
+_SUMMARY_HEAD_BYTES = 64 * 1024
+_SUMMARY_TAIL_BYTES = 16 * 1024
+
+# Media type for raw commit diffs; requests merges it over the session headers
+_DIFF_HEADERS = {"Accept": "application/vnd.github.v3.diff"}
+
+
+# Repository metadata, branches and recent default-branch commits in one GraphQL request
+_REPO_BUNDLE_QUERY = """
+query($owner: String!, $name: String!) {
+  repository(owner: $owner, name: $name) {
+    nameWithOwner
+    description
+    stargazerCount
+    forkCount
+    issues(states: OPEN) { totalCount }
+    pullRequests(states: OPEN) { totalCount }
+    primaryLanguage { name }
+    createdAt
+    updatedAt
+    url
+    defaultBranchRef {
+      name
+      target {
+        ... on Commit {
+          history(first: 10) { nodes { oid message author { name date } } }
+        }
+      }
+    }
+    refs(refPrefix: "refs/heads/", first: 100) {
+      pageInfo { hasNextPage }
+      nodes { name }
+    }
+  }
+}
+"""
+
+# Bundles answer back-to-back inspection calls; keep them only briefly
+_REPO_BUNDLE_TTL = 60.0
+_repo_bundle_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+
 
-def list_github_repos(type: str = "all") -> str:
+def _get_repo_bundle(repo: str) -> Optional[Dict[str, Any]]:
+    """
+    Get repository metadata, branches and recent commits, cached briefly per repository.
+
+    Returns:
+        The GraphQL "repository" object, or None if the query failed and the
+        caller should use the REST API instead
+    """
+    cached = _repo_bundle_cache.get(repo)
+    if cached is not None and cached[0] > time.monotonic():
+        return cached[1]
+
+    try:
+        owner, name = repo.split("/", 1)
+        bundle = github_api.graphql(_REPO_BUNDLE_QUERY, {"owner": owner, "name": name})["repository"]
+    except Exception as e:
+        logger.debug("GraphQL repository bundle unavailable for %s: %s", repo, e)
+        return None
+
+    if not isinstance(bundle, dict):
+        return None
+
+    _repo_bundle_cache[repo] = (time.monotonic() + _REPO_BUNDLE_TTL, bundle)
+    return bundle
+
+
+def _invalidate_repo_bundle(repo: str) -> None:
+    """Drop the cached bundle after a write that changes branches, commits or issues."""
+    _repo_bundle_cache.pop(repo, None)
+
+
+@functools.lru_cache(maxsize=256)
+def _default_branch(repo: str) -> str:
+    """Get a repository's default branch, memoized for the session."""
+    return github_api.get_default_branch(repo)
+
+
+@functools.lru_cache(maxsize=256)
+def _repo_push_ok(repo: str) -> bool:
+    """Check whether the token has push access to a repository, memoized for the session."""
+    url = repo_url(repo)
+    permissions = github_api.make_request("GET", url).json().get("permissions", {})
+    return bool(permissions.get("push", False))
+
+
+def list_github_repos(type: str = "all", limit: Optional[int] = None) -> str:
     """
     List the user's GitHub repositories.
 
     Args:
         type: Type of repositories to list (all, public, private, forks, sources, member)
+        limit: Maximum number of repositories to return (default: all)
 
     Returns:
         JSON string of repository names
     """
-    logger.info(f"Listing GitHub repositories of type: {type}")
+    logger.info("Listing GitHub repositories of type: %s", type)
 
     try:
-        url = f"{config.github_api_base_url}/user/repos"
+        url = api_url("user", "repos")
         params = {"type": type}
 
-        all_repos = github_api.get_paginated_results(url, params)
-        repo_names = [repo["full_name"] for repo in all_repos]
+        repo_names = [
+            repo["full_name"] for repo in github_api.iter_paginated_results(url, params, limit=limit)
+        ]
 
-        logger.info(f"Found {len(repo_names)} repositories")
+        logger.info("Found %s repositories", len(repo_names))
         return json.dumps(repo_names)
 
     except Exception as e:
@@ -59,16 +172,16 @@ def search_github_repos(query: str) -> str:
     Returns:
         JSON string of search results
     """
-    logger.info(f"Searching repositories for: {query}")
+    logger.info("Searching repositories for: %s", query)
 
     try:
-        encoded_query = urllib.parse.quote(f"{query} user:{config.github_username}")
-        url = f"{config.github_api_base_url}/search/code"
-        params = {"q": encoded_query}
+        # requests encodes query parameters itself; quoting here would double-encode
+        url = api_url("search", "code")
+        params = {"q": f"{query} user:{config.github_username}"}
 
         all_items = github_api.get_paginated_results(url, params, max_pages=10)
 
-        logger.info(f"Found {len(all_items)} search results")
+        logger.info("Found %s search results", len(all_items))
         return json.dumps(all_items)
 
     except Exception as e:
@@ -92,11 +205,13 @@ def get_bulk_codebase_overview(repo: str, branch: Optional[str] = None, max_file
     Returns:
         Structured blob containing overview of the codebase
     """
-    logger.info(f"Getting codebase overview: {repo} (max {max_files} files) on branch {branch}")
+    logger.info(
+        "Getting codebase overview: %s (max %s files) on branch %s", repo, max_files, branch
+    )
 
     try:
         if branch is None:
-            branch = github_api.get_default_branch(repo)
+            branch = _default_branch(repo)
 
         # Get repository structure
         structure_result = recursive_list_directory(repo, "", branch)
@@ -157,7 +272,7 @@ def get_bulk_codebase_overview(repo: str, branch: Optional[str] = None, max_file
             important_files.extend(source_files[:max_files-len(important_files)])
             
         except Exception as e:
-            logger.warning(f"Error parsing repository structure: {e}")
+            logger.warning("Error parsing repository structure: %s", e)
             # Fallback to common files
             important_files = ["README.md", "package.json", "requirements.txt", "setup.py"]
         
@@ -191,11 +306,11 @@ def get_bulk_file_content(repo: str, paths: List[str], branch: Optional[str] = N
     Returns:
         Structured blob containing all file contents with separators
     """
-    logger.info(f"Getting bulk file content: {repo} - {len(paths)} files on branch {branch}")
+    logger.info("Getting bulk file content: %s - %s files on branch %s", repo, len(paths), branch)
 
     try:
         if branch is None:
-            branch = github_api.get_default_branch(repo)
+            branch = _default_branch(repo)
 
         max_size_bytes = config.max_file_size_mb * 1024 * 1024
         successful_files = []
@@ -205,9 +320,9 @@ def get_bulk_file_content(repo: str, paths: List[str], branch: Optional[str] = N
         # Process each file
         for path in paths:
             try:
-                url = f"{config.github_api_base_url}/repos/{repo}/contents/{path}"
+                url = repo_url(repo, "contents", path)
                 response = github_api.make_request("GET", url, params={"ref": branch})
-                data = response.json()
+                data = _json_loads(response.content)
 
                 # Check if it's a directory
                 if isinstance(data, list):
@@ -229,7 +344,11 @@ def get_bulk_file_content(repo: str, paths: List[str], branch: Optional[str] = N
                 # Decode base64 content
                 content = data["content"]
                 try:
-                    decoded_content = base64.b64decode(content).decode('utf-8')
+                    raw_content = base64.b64decode(content)
+                    if _looks_binary(raw_content):
+                        error_files.append(f"{path} (binary/decode error)")
+                        continue
+                    decoded_content = raw_content.decode('utf-8')
                     successful_files.append((path, decoded_content))
                 except (UnicodeDecodeError, base64.binascii.Error):
                     error_files.append(f"{path} (binary/decode error)")
@@ -273,7 +392,12 @@ def get_bulk_file_content(repo: str, paths: List[str], branch: Optional[str] = N
         
         final_result = "\n".join(result)
         
-        logger.info(f"Bulk file read completed: {len(successful_files)} successful, {len(skipped_files)} skipped, {len(error_files)} errors")
+        logger.info(
+            "Bulk file read completed: %s successful, %s skipped, %s errors",
+            len(successful_files),
+            len(skipped_files),
+            len(error_files),
+        )
         return final_result
 
     except Exception as e:
@@ -282,6 +406,19 @@ def get_bulk_file_content(repo: str, paths: List[str], branch: Optional[str] = N
         return error_msg
 
 
+def _looks_binary(raw: bytes, sniff_bytes: int = 4096) -> bool:
+    """Check the start of a file for NUL bytes or invalid UTF-8 before decoding all of it."""
+    head = raw[:sniff_bytes]
+    if b"\0" in head:
+        return True
+    try:
+        # The incremental decoder tolerates a multi-byte character cut off at the end
+        codecs.getincrementaldecoder("utf-8")().decode(head, final=False)
+    except UnicodeDecodeError:
+        return True
+    return False
+
+
 def get_file_content(repo: str, path: str, branch: Optional[str] = None) -> str:
     """
     Get the content of a file in a GitHub repository.
@@ -294,15 +431,15 @@ def get_file_content(repo: str, path: str, branch: Optional[str] = None) -> str:
     Returns:
         File content as string or error message
     """
-    logger.info(f"Getting file content: {repo}/{path} on branch {branch}")
+    logger.info("Getting file content: %s/%s on branch %s", repo, path, branch)
 
     try:
         if branch is None:
-            branch = github_api.get_default_branch(repo)
+            branch = _default_branch(repo)
 
-        url = f"{config.github_api_base_url}/repos/{repo}/contents/{path}"
+        url = repo_url(repo, "contents", path)
         response = github_api.make_request("GET", url, params={"ref": branch})
-        data = response.json()
+        data = _json_loads(response.content)
 
         # Check if it's a directory
         if isinstance(data, list):
@@ -313,7 +450,7 @@ def get_file_content(repo: str, path: str, branch: Optional[str] = None) -> str:
         max_size_bytes = config.max_file_size_mb * 1024 * 1024
 
         if file_size > max_size_bytes:
-            logger.info(f"File {path} is large ({file_size} bytes), providing summary")
+            logger.info("File %s is large (%s bytes), providing summary", path, file_size)
             return _get_large_file_summary(repo, path, branch, file_size)
 
         # Check if content is available
@@ -323,8 +460,11 @@ def get_file_content(repo: str, path: str, branch: Optional[str] = None) -> str:
         # Decode base64 content
         content = data["content"]
         try:
-            decoded_content = base64.b64decode(content).decode("utf-8")
-            logger.info(f"Successfully retrieved file content: {len(decoded_content)} characters")
+            raw_content = base64.b64decode(content)
+            if _looks_binary(raw_content):
+                return "Error: File appears to be binary. Content cannot be decoded as UTF-8."
+            decoded_content = raw_content.decode("utf-8")
+            logger.info("Successfully retrieved file content: %s characters", len(decoded_content))
             return decoded_content
 
         except UnicodeDecodeError:
@@ -350,44 +490,95 @@ def _get_large_file_summary(repo: str, path: str, branch: str, file_size: int) -
         Summary of the file
     """
     try:
-        # Get raw content in chunks
-        raw_content = github_api.get_file_content_raw(repo, path, branch)
+        # Only the head and tail of the file are shown, so fetch just those bytes
+        head = github_api.get_file_content_range(repo, path, branch, 0, _SUMMARY_HEAD_BYTES - 1)
+        tail = github_api.get_file_content_range(repo, path, branch, -_SUMMARY_TAIL_BYTES)
+
+        # Drop the partial line at the cut edge of each chunk
+        head_lines = head.splitlines()
+        if file_size > _SUMMARY_HEAD_BYTES:
+            head_lines = head_lines[:-1]
+        tail_lines = tail.splitlines()
+        if file_size > _SUMMARY_TAIL_BYTES:
+            tail_lines = tail_lines[1:]
+
+        first_lines = head_lines[:50]
+        last_lines = tail_lines[-20:]
+
+        # The full line count would need the whole file; estimate it from the head
+        avg_line_bytes = max(len(head.encode("utf-8")) / max(len(head_lines), 1), 1)
+        total_lines = int(file_size / avg_line_bytes)
+
+        parts = [
+            f"📄 **Large File Summary: {path}**\n\n",
+            f"**File Size:** {file_size:,} bytes\n",
+            f"**Total Lines:** ≈{total_lines:,} (estimated)\n",
+            f"**File Type:** {path.split('.')[-1] if '.' in path else 'Unknown'}\n\n",
+            "**First 50 lines:**\n```\n",
+            "\n".join(first_lines),
+            "\n```\n\n",
+        ]
 
-        # Get first and last few lines for context
-        lines = raw_content.split("\n")
-        total_lines = len(lines)
+        if last_lines and total_lines > 70:
+            parts.extend([
+                f"**... (≈{total_lines - 70:,} lines omitted) ...**\n\n",
+                "**Last 20 lines:**\n```\n",
+                "\n".join(last_lines),
+                "\n```\n\n",
+            ])
 
-        # Show first 50 and last 20 lines
-        first_lines = lines[:50]
-        last_lines = lines[-20:] if total_lines > 70 else []
+        parts.append("💡 **Tip:** For specific sections, ask me to search for patterns or functions within this file.")
 
-        # Create summary
-        summary = f"📄 **Large File Summary: {path}**\n\n"
-        summary += f"**File Size:** {file_size:,} bytes\n"
-        summary += f"**Total Lines:** {total_lines:,}\n"
-        summary += f"**File Type:** {path.split('.')[-1] if '.' in path else 'Unknown'}\n\n"
+        return "".join(parts)
 
-        summary += "**First 50 lines:**\n```\n"
-        summary += "\n".join(first_lines)
-        summary += "\n```\n\n"
+    except Exception as e:
+        return f"Error getting large file summary: {str(e)}. File size: {file_size:,} bytes"
 
-        if last_lines and total_lines > 70:
-            summary += f"**... ({total_lines - 70:,} lines omitted) ...**\n\n"
-            summary += "**Last 20 lines:**\n```\n"
-            summary += "\n".join(last_lines)
-            summary += "\n```\n\n"
 
-        summary += "💡 **Tip:** For specific sections, ask me to search for patterns or functions within this file."
+def _git_blob_sha(content: str) -> str:
+    """Compute the SHA Git assigns to a blob with the given content."""
+    data = content.encode("utf-8")
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
 
-        return summary
+def _drop_unchanged_files(repo: str, base_tree_sha: str, tree: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Remove tree entries whose content is identical to the file in the base tree.
+
+    Args:
+        repo: Repository name in format 'owner/repo'
+        base_tree_sha: SHA of the tree the new commit builds on
+        tree: Tree entries with inline content
 
+    Returns:
+        Entries that actually change something; all of them if the base tree
+        can't be read completely
+    """
+    url = repo_url(repo, "git/trees", base_tree_sha)
+    try:
+        data = _json_loads(github_api.make_request("GET", url, params={"recursive": "1"}).content)
     except Exception as e:
-        return f"Error getting large file summary: {str(e)}. File size: {file_size:,} bytes"
+        logger.warning("Could not compare files against the base tree: %s", e)
+        return tree
+
+    if data.get("truncated"):
+        return tree
+
+    existing = {entry["path"]: entry["sha"] for entry in data.get("tree", []) if entry.get("type") == "blob"}
+    changed = [item for item in tree if existing.get(item["path"]) != _git_blob_sha(item["content"])]
+
+    if len(changed) < len(tree):
+        logger.info("Skipping %s unchanged file(s)", len(tree) - len(changed))
+    return changed
 
 
 def _create_files_in_empty_repo(repo: str, files: List[Dict[str, str]], branch: str) -> str:
     """
-    Create files in an empty repository using the Contents API.
+    Create files in an empty repository.
+
+    The first file goes through the Contents API, which initializes the repository.
+    Once a commit exists, the remaining files are added in a single tree and commit
+    via the Git Data API instead of one Contents API commit per file.
 
     Args:
         repo: Repository name in format 'owner/repo'
@@ -397,22 +588,53 @@ def _create_files_in_empty_repo(repo: str, files: List[Dict[str, str]], branch:
     Returns:
         Success message or error message
     """
-    logger.info(f"Creating files in empty repository {repo}")
+    logger.info("Creating files in empty repository %s", repo)
 
     try:
-        # Create files one by one using Contents API
-        for file_change in files:
-            file_path = file_change["file_path"]
-            content = file_change["new_content"]
-
-            # Encode content as base64
-            encoded_content = base64.b64encode(content.encode("utf-8")).decode("utf-8")
+        first_file, remaining_files = files[0], files[1:]
+
+        # Contents API writes to the same branch conflict when sent concurrently,
+        # so only the initializing commit uses it
+        file_path = first_file["file_path"]
+        encoded_content = base64.b64encode(first_file["new_content"].encode("utf-8")).decode("utf-8")
+        url = repo_url(repo, "contents", file_path)
+        data = {"message": f"Create {file_path}", "content": encoded_content, "branch": branch}
+
+        response = github_api.make_request("PUT", url, data=data)
+        initial_commit = response.json()["commit"]
+        logger.info("Created file: %s", file_path)
+
+        if not remaining_files:
+            return "Files created successfully in empty repository"
+
+        tree_url = repo_url(repo, "git/trees")
+        tree_data = {
+            "base_tree": initial_commit["tree"]["sha"],
+            "tree": [
+                {
+                    "path": file_change["file_path"],
+                    "mode": "100644",
+                    "type": "blob",
+                    "content": file_change["new_content"],
+                }
+                for file_change in remaining_files
+            ],
+        }
+        response = github_api.make_request("POST", tree_url, data=tree_data)
+        tree_sha = response.json()["sha"]
 
-            url = f"{config.github_api_base_url}/repos/{repo}/contents/{file_path}"
-            data = {"message": f"Create {file_path}", "content": encoded_content, "branch": branch}
+        commit_url = repo_url(repo, "git/commits")
+        commit_data = {
+            "message": f"Create {len(remaining_files)} files",
+            "tree": tree_sha,
+            "parents": [initial_commit["sha"]],
+        }
+        response = github_api.make_request("POST", commit_url, data=commit_data)
+        commit_sha = response.json()["sha"]
 
-            github_api.make_request("PUT", url, data=data)
-            logger.info(f"Created file: {file_path}")
+        ref_url = repo_url(repo, "git/refs/heads", branch)
+        github_api.make_request("PATCH", ref_url, data={"sha": commit_sha})
+        logger.info("Created %s files in one commit on %s", len(remaining_files), branch)
 
         return "Files created successfully in empty repository"
 
@@ -422,6 +644,13 @@ def _create_files_in_empty_repo(repo: str, files: List[Dict[str, str]], branch:
         return error_msg
 
 
+# Peer review of a pull request that was sent back for changes, per repository. The
+# follow-up iterate_pull_request call continues the same reviewer conversation, so the
+# reviewer keeps its history and is only sent what changed. A review that reached a
+# final decision is dropped, so it never carries over to an unrelated pull request.
+_peer_review_sessions: Dict[str, Tuple[PeerReviewOrchestrator, PeerReviewContext]] = {}
+
+
 def create_pull_request(
     repo: str,
     title: str,
@@ -432,6 +661,7 @@ def create_pull_request(
     base_branch: Optional[str] = None,
     enable_peer_review: Optional[bool] = None,
     user_request_context: Optional[str] = None,
+    continue_review: bool = False,
 ) -> str:
     """
     Create a pull request in a GitHub repository with changes to multiple files.
@@ -446,11 +676,13 @@ def create_pull_request(
         base_branch: Base branch (defaults to repository's default branch)
         enable_peer_review: Enable peer review (defaults to config setting)
         user_request_context: Original user request for context in peer review
+        continue_review: Continue the peer review of the previous attempt on this
+            repository instead of starting a new one
 
     Returns:
         URL of the created pull request or error message
     """
-    logger.info(f"Creating pull request in {repo}: {title}")
+    logger.info("Creating pull request in %s: %s", repo, title)
 
     try:
         if not files or not isinstance(files, list) or len(files) == 0:
@@ -465,30 +697,53 @@ def create_pull_request(
             logger.info("Peer review enabled - initiating peer review process")
             
             try:
-                # Create peer review context with user request context
-                review_context = create_peer_review_context(
-                    repo=repo,
-                    title=title,
-                    body=body,
-                    files=files,
-                    commit_message=commit_message,
-                    branch_name=new_branch,
-                    base_branch=base_branch,
-                    user_request=user_request_context
-                )
+                session = _peer_review_sessions.pop(repo, None)
+                if continue_review and session is not None:
+                    # Same reviewer and review history, updated submission
+                    orchestrator, previous_context = session
+                    review_context = replace(
+                        previous_context,
+                        title=title,
+                        body=body,
+                        files=files,
+                        commit_message=commit_message,
+                        branch_name=new_branch,
+                        base_branch=base_branch,
+                        user_request=user_request_context or previous_context.user_request,
+                    )
+                else:
+                    # Create peer review context with user request context
+                    review_context = create_peer_review_context(
+                        repo=repo,
+                        title=title,
+                        body=body,
+                        files=files,
+                        commit_message=commit_message,
+                        branch_name=new_branch,
+                        base_branch=base_branch,
+                        user_request=user_request_context
+                    )
+                    orchestrator = PeerReviewOrchestrator()
                 
                 # Orchestrate peer review
-                orchestrator = PeerReviewOrchestrator()
                 review_result = orchestrator.orchestrate_review(review_context)
                 
                 if not review_result.should_proceed:
+                    if (
+                        review_result.decision == ReviewDecision.REQUEST_CHANGES
+                        and review_context.current_iteration < config.max_review_iterations
+                    ):
+                        # Keep the session for the follow-up iteration
+                        _peer_review_sessions[repo] = (orchestrator, review_context)
                     # Return feedback to main agent for iteration
                     return review_result.to_agent_message()
                 
-                logger.info("Peer review completed successfully - proceeding with GitHub submission")
+                logger.info(
+                    "Peer review completed successfully - proceeding with GitHub submission"
+                )
                 
             except Exception as e:
-                logger.error(f"Peer review system failed: {str(e)}")
+                logger.error("Peer review system failed: %s", e)
                 
                 # Fallback: Ask user whether to proceed without peer review
                 from rich.console import Console
@@ -511,59 +766,73 @@ def create_pull_request(
         else:
             logger.info("Peer review disabled - proceeding directly with GitHub submission")
 
-        # Validate repository access and permissions upfront
-        try:
-            repo_url = f"{config.github_api_base_url}/repos/{repo}"
-            repo_response = github_api.make_request("GET", repo_url)
-            repo_data = repo_response.json()
-            permissions = repo_data.get("permissions", {})
+        # The tree/commit/ref requests below already report permission problems, so the
+        # pre-flight access check is opt-in. With a known base branch the ref lookup
+        # doesn't depend on it, so the two round-trips overlap.
+        ref_future: Optional[Future] = None
+        if config.pr_preflight_permission_check:
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                if base_branch is not None:
+                    ref_future = executor.submit(
+                        github_api.make_request,
+                        "GET",
+                        repo_url(repo, "git/ref/heads", base_branch),
+                    )
 
-            if not permissions.get("push", False):
-                return (
-                    f"Error: Insufficient permissions for repository '{repo}'.\n"
-                    f"Your GitHub token needs 'push' access to create pull requests.\n"
-                    f"Current permissions: {permissions}"
-                )
-        except Exception as e:
-            if "404" in str(e):
-                return (
-                    f"Error: Repository '{repo}' not found or not accessible.\n"
-                    f"Please check:\n"
-                    f"  - Repository name is correct\n"
-                    f"  - GitHub token has access to this repository\n"
-                    f"  - Repository exists and is not private (if using public token)"
-                )
-            else:
-                logger.warning(f"Could not validate repository permissions: {e}")
+                try:
+                    if not _repo_push_ok(repo):
+                        return (
+                            f"Error: Insufficient permissions for repository '{repo}'.\n"
+                            f"Your GitHub token needs 'push' access to create pull requests."
+                        )
+                except Exception as e:
+                    if isinstance(e, GitHubHTTPError) and e.status_code == 404:
+                        return (
+                            f"Error: Repository '{repo}' not found or not accessible.\n"
+                            f"Please check:\n"
+                            f"  - Repository name is correct\n"
+                            f"  - GitHub token has access to this repository\n"
+                            f"  - Repository exists and is not private (if using public token)"
+                        )
+                    else:
+                        logger.warning("Could not validate repository permissions: %s", e)
 
         if base_branch is None:
-            base_branch = github_api.get_default_branch(repo)
+            base_branch = _default_branch(repo)
 
         # Get base commit SHA
-        ref_url = f"{config.github_api_base_url}/repos/{repo}/git/ref/heads/{base_branch}"
+        ref_url = repo_url(repo, "git/ref/heads", base_branch)
         try:
-            response = github_api.make_request("GET", ref_url)
+            if ref_future is not None:
+                response = ref_future.result()
+            else:
+                response = github_api.make_request("GET", ref_url)
             base_commit_sha = response.json()["object"]["sha"]
-        except Exception as e:
-            if "404" in str(e):
+        except GitHubHTTPError as e:
+            if e.status_code == 404:
                 # Repository is likely empty - use Contents API to create files directly on new branch
                 logger.info(
-                    f"Repository {repo} appears to be empty, creating files on new branch {new_branch}"
+                    "Repository %s appears to be empty, creating files on new branch %s",
+                    repo,
+                    new_branch,
                 )
 
                 # Create files using Contents API directly on the new branch
                 create_result = _create_files_in_empty_repo(repo, files, new_branch)
                 if "Error" in create_result:
                     return create_result
+                # The first commit can change the repository's default branch
+                _default_branch.cache_clear()
+                _invalidate_repo_bundle(repo)
 
                 # Create pull request (base branch should be empty, new branch has files)
-                pr_url = f"{config.github_api_base_url}/repos/{repo}/pulls"
+                pr_url = repo_url(repo, "pulls")
                 pr_data = {"title": title, "body": body, "head": new_branch, "base": base_branch}
 
                 try:
                     response = github_api.make_request("POST", pr_url, data=pr_data)
                     pr_html_url = response.json()["html_url"]
-                    logger.info(f"Pull request created successfully: {pr_html_url}")
+                    logger.info("Pull request created successfully: %s", pr_html_url)
                     return str(pr_html_url)
                 except Exception as e4:
                     return f"Error creating pull request: {str(e4)}"
@@ -571,12 +840,12 @@ def create_pull_request(
                 raise
 
         # Get base tree SHA
-        commit_url = f"{config.github_api_base_url}/repos/{repo}/git/commits/{base_commit_sha}"
+        commit_url = repo_url(repo, "git/commits", base_commit_sha)
         try:
             response = github_api.make_request("GET", commit_url)
             base_tree_sha = response.json()["tree"]["sha"]
-        except Exception as e:
-            if "404" in str(e):
+        except GitHubHTTPError as e:
+            if e.status_code == 404:
                 return (
                     f"Error: Unable to get commit tree (404).\n"
                     f"This typically indicates:\n"
@@ -605,21 +874,29 @@ def create_pull_request(
                 }
             )
 
+        # Regenerated-but-identical files would only end in an empty PR, so drop them
+        tree = _drop_unchanged_files(repo, base_tree_sha, tree)
+        if not tree:
+            return (
+                f"No changes to submit: all {len(files)} file(s) already match '{base_branch}' in {repo}. "
+                f"No branch or pull request was created."
+            )
+
         # Create new tree
-        tree_url = f"{config.github_api_base_url}/repos/{repo}/git/trees"
+        tree_url = repo_url(repo, "git/trees")
         tree_data = {"base_tree": base_tree_sha, "tree": tree}
         
         # Log the tree creation for debugging
-        logger.info(f"Creating tree with base_tree: {base_tree_sha}, {len(tree)} files")
+        logger.info("Creating tree with base_tree: %s, %s files", base_tree_sha, len(tree))
         for file_item in tree:
-            logger.info(f"  - {file_item['path']}")
+            logger.info("  - %s", file_item['path'])
 
         try:
             response = github_api.make_request("POST", tree_url, data=tree_data)
             new_tree_sha = response.json()["sha"]
-            logger.info(f"Successfully created tree: {new_tree_sha}")
-        except Exception as e:
-            if "404" in str(e):
+            logger.info("Successfully created tree: %s", new_tree_sha)
+        except GitHubHTTPError as e:
+            if e.status_code == 404:
                 return (
                     f"Error: Unable to create git tree (404). This typically indicates:\n"
                     f"  - Insufficient repository permissions (needs 'push' access)\n"
@@ -636,7 +913,7 @@ def create_pull_request(
                 raise
 
         # Create new commit
-        commit_url = f"{config.github_api_base_url}/repos/{repo}/git/commits"
+        commit_url = repo_url(repo, "git/commits")
         commit_data = {
             "message": commit_message,
             "tree": new_tree_sha,
@@ -646,8 +923,8 @@ def create_pull_request(
         try:
             response = github_api.make_request("POST", commit_url, data=commit_data)
             new_commit_sha = response.json()["sha"]
-        except Exception as e:
-            if "404" in str(e):
+        except GitHubHTTPError as e:
+            if e.status_code == 404:
                 return (
                     f"Error: Unable to create commit (404). This typically indicates:\n"
                     f"  - Authentication/permission issue with repository\n"
@@ -658,35 +935,36 @@ def create_pull_request(
                 raise
 
         # Create new branch
-        branch_url = f"{config.github_api_base_url}/repos/{repo}/git/refs"
+        branch_url = repo_url(repo, "git/refs")
         branch_data = {"ref": f"refs/heads/{new_branch}", "sha": new_commit_sha}
 
         try:
             github_api.make_request("POST", branch_url, data=branch_data)
-        except Exception as e:
-            if "404" in str(e):
+            _invalidate_repo_bundle(repo)
+        except GitHubHTTPError as e:
+            if e.status_code == 404:
                 return (
                     f"Error: Unable to create branch '{new_branch}' (404). This typically indicates:\n"
                     f"  - Insufficient repository permissions\n"
                     f"  - Authentication issue with GitHub token\n"
                     f"Original error: {str(e)}"
                 )
-            elif "422" in str(e):
+            elif e.status_code == 422:
                 return f"Error: Branch '{new_branch}' already exists. Please use a different branch name."
             else:
                 raise
 
         # Create pull request
-        pr_url = f"{config.github_api_base_url}/repos/{repo}/pulls"
+        pr_url = repo_url(repo, "pulls")
         pr_data = {"title": title, "body": body, "head": new_branch, "base": base_branch}
 
         try:
             response = github_api.make_request("POST", pr_url, data=pr_data)
             pr_html_url = response.json()["html_url"]
-            logger.info(f"Pull request created successfully: {pr_html_url}")
+            logger.info("Pull request created successfully: %s", pr_html_url)
             return str(pr_html_url)
-        except Exception as e:
-            if "404" in str(e):
+        except GitHubHTTPError as e:
+            if e.status_code == 404:
                 return (
                     f"Error: Unable to create pull request (404). This typically indicates:\n"
                     f"  - Insufficient repository permissions\n"
@@ -694,7 +972,7 @@ def create_pull_request(
                     f"  - Authentication issue with GitHub token\n"
                     f"Original error: {str(e)}"
                 )
-            elif "422" in str(e):
+            elif e.status_code == 422:
                 return f"Error: Pull request validation failed. Branch '{new_branch}' may have no changes or already has a PR."
             else:
                 raise
@@ -705,24 +983,30 @@ def create_pull_request(
         return error_msg
 
 
-def list_repo_branches(repo: str) -> str:
+def list_repo_branches(repo: str, limit: Optional[int] = None) -> str:
     """
     List all branches in a GitHub repository.
 
     Args:
         repo: Repository name in format 'owner/repo'
+        limit: Maximum number of branches to return (default: all)
 
     Returns:
         JSON string of branch names
     """
-    logger.info(f"Listing branches for repository: {repo}")
+    logger.info("Listing branches for repository: %s", repo)
 
     try:
-        url = f"{config.github_api_base_url}/repos/{repo}/branches"
-        all_branches = github_api.get_paginated_results(url)
-        branch_names = [branch["name"] for branch in all_branches]
+        bundle = _get_repo_bundle(repo)
+        if bundle is not None and not bundle["refs"]["pageInfo"]["hasNextPage"]:
+            branch_names = [ref["name"] for ref in bundle["refs"]["nodes"]][:limit]
+        else:
+            url = repo_url(repo, "branches")
+            branch_names = [
+                branch["name"] for branch in github_api.iter_paginated_results(url, limit=limit)
+            ]
 
-        logger.info(f"Found {len(branch_names)} branches")
+        logger.info("Found %s branches", len(branch_names))
         return json.dumps(branch_names)
 
     except Exception as e:
@@ -731,6 +1015,23 @@ def list_repo_branches(repo: str) -> str:
         return error_msg
 
 
+def _list_directory_contents_items(repo: str, path: str, branch: str) -> Optional[List[Dict[str, Any]]]:
+    """
+    Fetch the entries of a directory via the Contents API.
+
+    Returns:
+        List of name/type/path entries, or None if the path is not a directory
+    """
+    url = repo_url(repo, "contents", path)
+    response = github_api.make_request("GET", url, params={"ref": branch})
+    data = _json_loads(response.content)
+
+    if not isinstance(data, list):
+        return None
+
+    return [{"name": item["name"], "type": item["type"], "path": item["path"]} for item in data]
+
+
 def list_directory_contents(repo: str, path: str = "", branch: Optional[str] = None) -> str:
     """
     List files and subdirectories in a specified path within a GitHub repository.
@@ -743,25 +1044,18 @@ def list_directory_contents(repo: str, path: str = "", branch: Optional[str] = N
     Returns:
         JSON string of directory contents
     """
-    logger.info(f"Listing directory contents: {repo}/{path} on branch {branch}")
+    logger.info("Listing directory contents: %s/%s on branch %s", repo, path, branch)
 
     try:
         if branch is None:
-            branch = github_api.get_default_branch(repo)
-
-        url = f"{config.github_api_base_url}/repos/{repo}/contents/{path}"
-        response = github_api.make_request("GET", url, params={"ref": branch})
-        data = response.json()
+            branch = _default_branch(repo)
 
-        if not isinstance(data, list):
+        contents = _list_directory_contents_items(repo, path, branch)
+        if contents is None:
             return f"Error: '{path}' is not a directory"
 
-        contents = [
-            {"name": item["name"], "type": item["type"], "path": item["path"]} for item in data
-        ]
-
-        logger.info(f"Found {len(contents)} items in directory")
-        return json.dumps(contents)
+        logger.info("Found %s items in directory", len(contents))
+        return _json_dumps(contents)
 
     except Exception as e:
         error_msg = f"Error listing directory contents: {str(e)}"
@@ -779,12 +1073,30 @@ def get_repo_info(repo: str) -> str:
     Returns:
         JSON string of repository information
     """
-    logger.info(f"Getting repository information: {repo}")
+    logger.info("Getting repository information: %s", repo)
 
     try:
-        url = f"{config.github_api_base_url}/repos/{repo}"
+        bundle = _get_repo_bundle(repo)
+        if bundle is not None:
+            info = {
+                "full_name": bundle.get("nameWithOwner"),
+                "description": bundle.get("description"),
+                "stars": bundle.get("stargazerCount"),
+                "forks": bundle.get("forkCount"),
+                # REST counts open pull requests as issues too
+                "open_issues": bundle["issues"]["totalCount"] + bundle["pullRequests"]["totalCount"],
+                "default_branch": (bundle.get("defaultBranchRef") or {}).get("name"),
+                "language": (bundle.get("primaryLanguage") or {}).get("name"),
+                "created_at": bundle.get("createdAt"),
+                "updated_at": bundle.get("updatedAt"),
+                "html_url": bundle.get("url"),
+            }
+            logger.info("Retrieved repository information successfully")
+            return _json_dumps(info)
+
+        url = repo_url(repo)
         response = github_api.make_request("GET", url)
-        data = response.json()
+        data = _json_loads(response.content)
 
         info = {
             "full_name": data.get("full_name"),
@@ -800,7 +1112,7 @@ def get_repo_info(repo: str) -> str:
         }
 
         logger.info("Retrieved repository information successfully")
-        return json.dumps(info)
+        return _json_dumps(info)
 
     except Exception as e:
         error_msg = f"Error getting repository info: {str(e)}"
@@ -809,7 +1121,12 @@ def get_repo_info(repo: str) -> str:
 
 
 def manage_issues(
-    repo: str, action: str, title: Optional[str] = None, body: str = "", labels: List[str] = []
+    repo: str,
+    action: str,
+    title: Optional[str] = None,
+    body: str = "",
+    labels: List[str] = [],
+    limit: Optional[int] = None,
 ) -> str:
     """
     List open issues or create a new issue in a GitHub repository.
@@ -820,34 +1137,39 @@ def manage_issues(
         title: Issue title (required for 'create' action)
         body: Issue description (optional for 'create' action)
         labels: List of labels to apply (optional for 'create' action)
+        limit: Maximum number of issues to return for 'list' (default: all)
 
     Returns:
         JSON string of issues or URL of created issue
     """
-    logger.info(f"Managing issues in {repo}: action={action}")
+    logger.info("Managing issues in %s: action=%s", repo, action)
 
     try:
         if action == "list":
-            url = f"{config.github_api_base_url}/repos/{repo}/issues"
-            params = {"state": "open"}
+            url = repo_url(repo, "issues")
+            params = {"state": "open", "per_page": 100}
 
-            all_issues = github_api.get_paginated_results(url, params)
-            issues = [{"number": issue["number"], "title": issue["title"]} for issue in all_issues]
+            issues = [
+                {"number": issue["number"], "title": issue["title"]}
+                for issue in github_api.iter_paginated_results(url, params, limit=limit)
+            ]
 
-            logger.info(f"Found {len(issues)} open issues")
+            logger.info("Found %s open issues", len(issues))
             return json.dumps(issues)
 
         elif action == "create":
             if not title:
                 return "Error: Title required for creating an issue"
 
-            url = f"{config.github_api_base_url}/repos/{repo}/issues"
+            url = repo_url(repo, "issues")
             data = {"title": title, "body": body, "labels": labels}
 
             response = github_api.make_request("POST", url, data=data)
             issue_url = response.json()["html_url"]
+            # The bundle carries the open issue count reported by get_repo_info
+            _invalidate_repo_bundle(repo)
 
-            logger.info(f"Issue created successfully: {issue_url}")
+            logger.info("Issue created successfully: %s", issue_url)
             return str(issue_url)
 
         else:
@@ -859,6 +1181,49 @@ def manage_issues(
         return error_msg
 
 
+def _build_tree_listing(repo: str, path: str, branch: str) -> Optional[List[Dict[str, Any]]]:
+    """
+    Build a nested directory listing from a single recursive Git Trees API call.
+
+    Returns:
+        Listing in the same shape as recursive_list_directory, or None if GitHub
+        truncated the tree and the per-directory walk is needed instead
+    """
+    url = repo_url(repo, "git/trees", branch)
+    response = github_api.make_request("GET", url, params={"recursive": "1"})
+    data = _json_loads(response.content)
+
+    if data.get("truncated"):
+        logger.info("Git tree for %s@%s is truncated", repo, branch)
+        return None
+
+    base = path.strip("/")
+    prefix = f"{base}/" if base else ""
+    result: List[Dict[str, Any]] = []
+    # Maps a directory path to the list its children are appended to
+    children: Dict[str, List[Dict[str, Any]]] = {base: result}
+
+    # Sorting by path guarantees every directory is seen before its contents
+    for entry in sorted(data.get("tree", []), key=lambda item: item["path"]):
+        entry_path = entry["path"]
+        if not entry_path.startswith(prefix):
+            continue
+
+        parent, _, name = entry_path.rpartition("/")
+        siblings = children.get(parent)
+        if siblings is None:
+            continue
+
+        if entry["type"] == "tree":
+            contents: List[Dict[str, Any]] = []
+            children[entry_path] = contents
+            siblings.append({"name": name, "type": "dir", "path": entry_path, "contents": contents})
+        else:
+            siblings.append({"name": name, "type": "file", "path": entry_path})
+
+    return result
+
+
 def recursive_list_directory(repo: str, path: str = "", branch: Optional[str] = None) -> str:
     """
     Recursively list all files and subdirectories in a GitHub repository.
@@ -871,35 +1236,55 @@ def recursive_list_directory(repo: str, path: str = "", branch: Optional[str] =
     Returns:
         JSON string of recursive directory structure
     """
-    logger.info(f"Recursively listing directory: {repo}/{path} on branch {branch}")
+    logger.info("Recursively listing directory: %s/%s on branch %s", repo, path, branch)
 
-    def recurse(current_path: str) -> List[Dict[str, Any]]:
-        """Recursively get directory contents."""
+    def list_dir(dir_path: str) -> List[Dict[str, Any]]:
+        """List one directory, treating errors and non-directories as empty."""
         try:
-            contents_json = list_directory_contents(repo, current_path, branch)
-            contents = json.loads(contents_json)
-
-            result = []
-            for item in contents:
-                if item["type"] == "dir":
-                    result.append(
-                        {
-                            "name": item["name"],
-                            "type": "dir",
-                            "path": item["path"],
-                            "contents": recurse(item["path"]),
-                        }
-                    )
-                else:
-                    result.append({"name": item["name"], "type": "file", "path": item["path"]})
-            return result
-
+            return _list_directory_contents_items(repo, dir_path, branch) or []
         except Exception as e:
-            logger.error(f"Error in recursive listing for {current_path}: {str(e)}")
+            logger.error("Error in recursive listing for %s: %s", dir_path, e)
             return []
 
+    def walk(start_path: str) -> List[Dict[str, Any]]:
+        """Walk the Contents API breadth-first, listing each level's directories concurrently."""
+        result: List[Dict[str, Any]] = []
+        # (directory path, list its entries are appended to)
+        frontier = [(start_path, result)]
+
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            while frontier:
+                next_frontier = []
+                level = executor.map(list_dir, [dir_path for dir_path, _ in frontier])
+                for (_, siblings), contents in zip(frontier, level):
+                    for item in contents:
+                        if item["type"] == "dir":
+                            children: List[Dict[str, Any]] = []
+                            siblings.append(
+                                {"name": item["name"], "type": "dir", "path": item["path"], "contents": children}
+                            )
+                            next_frontier.append((item["path"], children))
+                        else:
+                            siblings.append({"name": item["name"], "type": "file", "path": item["path"]})
+                frontier = next_frontier
+
+        return result
+
     try:
-        result = recurse(path)
+        if branch is None:
+            branch = _default_branch(repo)
+
+        # One Git Trees API call covers the whole repository; only walk directory
+        # by directory when GitHub truncates the tree or the call fails
+        try:
+            result = _build_tree_listing(repo, path, branch)
+        except Exception as e:
+            logger.warning("Git Trees API listing failed, walking directories instead: %s", e)
+            result = None
+
+        if result is None:
+            result = walk(path)
+
         logger.info("Recursive listing completed successfully")
         return json.dumps(result)
 
@@ -921,17 +1306,34 @@ def get_commit_history(repo: str, branch: Optional[str] = None, max_commits: int
     Returns:
         JSON string of commit history
     """
-    logger.info(f"Getting commit history for {repo} on branch {branch}")
+    logger.info("Getting commit history for %s on branch %s", repo, branch)
 
     try:
+        # The bundle carries the last 10 commits of the default branch
+        if max_commits <= 10:
+            bundle = _get_repo_bundle(repo)
+            default_ref = (bundle or {}).get("defaultBranchRef")
+            if default_ref and branch in (None, default_ref["name"]):
+                commits = [
+                    {
+                        "sha": node["oid"],
+                        "message": node["message"],
+                        "author": node["author"]["name"],
+                        "date": node["author"]["date"],
+                    }
+                    for node in default_ref["target"]["history"]["nodes"][:max_commits]
+                ]
+                logger.info("Retrieved %s commits", len(commits))
+                return _json_dumps(commits)
+
         if branch is None:
-            branch = github_api.get_default_branch(repo)
+            branch = _default_branch(repo)
 
-        url = f"{config.github_api_base_url}/repos/{repo}/commits"
+        url = repo_url(repo, "commits")
         params = {"sha": branch, "per_page": max_commits}
 
         response = github_api.make_request("GET", url, params=params)
-        commits_data = response.json()
+        commits_data = _json_loads(response.content)
 
         commits = [
             {
@@ -943,8 +1345,8 @@ def get_commit_history(repo: str, branch: Optional[str] = None, max_commits: int
             for commit in commits_data
         ]
 
-        logger.info(f"Retrieved {len(commits)} commits")
-        return json.dumps(commits)
+        logger.info("Retrieved %s commits", len(commits))
+        return _json_dumps(commits)
 
     except Exception as e:
         error_msg = f"Error getting commit history: {str(e)}"
@@ -967,19 +1369,19 @@ def delete_file(
     Returns:
         Success message or error message
     """
-    logger.info(f"Deleting file: {repo}/{path} on branch {branch}")
+    logger.info("Deleting file: %s/%s on branch %s", repo, path, branch)
 
     try:
         if branch is None:
-            branch = github_api.get_default_branch(repo)
+            branch = _default_branch(repo)
 
         # Get current file SHA
-        url = f"{config.github_api_base_url}/repos/{repo}/contents/{path}"
+        url = repo_url(repo, "contents", path)
         try:
             response = github_api.make_request("GET", url, params={"ref": branch})
             file_sha = response.json()["sha"]
-        except Exception as e:
-            if "404" in str(e):
+        except GitHubHTTPError as e:
+            if e.status_code == 404:
                 return f"Error: File '{path}' not found in repository '{repo}' on branch '{branch}'"
             else:
                 raise
@@ -988,8 +1390,9 @@ def delete_file(
         delete_data = {"message": commit_message, "sha": file_sha, "branch": branch}
         try:
             github_api.make_request("DELETE", url, data=delete_data)
-        except Exception as e:
-            if "404" in str(e):
+            _invalidate_repo_bundle(repo)
+        except GitHubHTTPError as e:
+            if e.status_code == 404:
                 return (
                     f"Error: Unable to delete file (404). This typically indicates:\n"
                     f"  - Insufficient repository permissions (needs 'push' access)\n"
@@ -997,12 +1400,12 @@ def delete_file(
                     f"  - File may have been deleted by another process\n"
                     f"Original error: {str(e)}"
                 )
-            elif "409" in str(e):
+            elif e.status_code == 409:
                 return "Error: File deletion conflict. The file may have been modified since you last accessed it."
             else:
                 raise
 
-        logger.info(f"File deleted successfully: {path}")
+        logger.info("File deleted successfully: %s", path)
         return "File deleted successfully"
 
     except Exception as e:
@@ -1011,6 +1414,22 @@ def delete_file(
         return error_msg
 
 
+def _file_entry(file: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep the per-file fields returned by the commit and comparison tools."""
+    return {
+        "filename": file["filename"],
+        "status": file["status"],
+        "additions": file["additions"],
+        "deletions": file["deletions"],
+        "changes": file["changes"],
+    }
+
+
+def _person_entry(person: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep the fields returned for a commit's author or committer."""
+    return {"name": person["name"], "email": person["email"], "date": person["date"]}
+
+
 def get_commit_details(repo: str, commit_sha: str) -> str:
     """
     Get detailed information about a specific commit.
@@ -1022,43 +1441,26 @@ def get_commit_details(repo: str, commit_sha: str) -> str:
     Returns:
         JSON string with commit details including files changed, additions, deletions
     """
-    logger.info(f"Getting commit details for {repo}: {commit_sha}")
+    logger.info("Getting commit details for %s: %s", repo, commit_sha)
 
     try:
-        url = f"{config.github_api_base_url}/repos/{repo}/commits/{commit_sha}"
+        url = repo_url(repo, "commits", commit_sha)
         response = github_api.make_request("GET", url)
-        commit_data = response.json()
+        commit_data = _json_loads(response.content)
 
         # Extract key information
         details = {
             "sha": commit_data["sha"],
             "message": commit_data["commit"]["message"],
-            "author": {
-                "name": commit_data["commit"]["author"]["name"],
-                "email": commit_data["commit"]["author"]["email"],
-                "date": commit_data["commit"]["author"]["date"],
-            },
-            "committer": {
-                "name": commit_data["commit"]["committer"]["name"],
-                "email": commit_data["commit"]["committer"]["email"],
-                "date": commit_data["commit"]["committer"]["date"],
-            },
+            "author": _person_entry(commit_data["commit"]["author"]),
+            "committer": _person_entry(commit_data["commit"]["committer"]),
             "stats": commit_data["stats"],
-            "files": [
-                {
-                    "filename": file["filename"],
-                    "status": file["status"],
-                    "additions": file["additions"],
-                    "deletions": file["deletions"],
-                    "changes": file["changes"],
-                }
-                for file in commit_data["files"]
-            ],
+            "files": [_file_entry(file) for file in commit_data["files"]],
             "url": commit_data["html_url"],
         }
 
-        logger.info(f"Retrieved commit details: {len(details['files'])} files changed")
-        return json.dumps(details)
+        logger.info("Retrieved commit details: %s files changed", len(details['files']))
+        return _json_dumps(details)
 
     except Exception as e:
         error_msg = f"Error getting commit details: {str(e)}"
@@ -1075,22 +1477,26 @@ def get_commit_diff(repo: str, commit_sha: str) -> str:
         commit_sha: Commit SHA hash
 
     Returns:
-        String containing the full diff patch
+        String containing the diff patch, cut off after MAX_FILE_SIZE_MB
     """
-    logger.info(f"Getting commit diff for {repo}: {commit_sha}")
+    logger.info("Getting commit diff for %s: %s", repo, commit_sha)
 
     try:
-        url = f"{config.github_api_base_url}/repos/{repo}/commits/{commit_sha}"
-        headers = {"Accept": "application/vnd.github.v3.diff"}
+        url = repo_url(repo, "commits", commit_sha)
 
         # Get the diff by requesting with diff accept header
-        diff_response = github_api.session.get(
-            url, headers={**github_api.session.headers, **headers}
-        )
-        diff_response.raise_for_status()
+        diff_response = github_api.make_request("GET", url, headers=_DIFF_HEADERS)
+
+        # Decode the raw bytes once, and only as much of them as will be returned
+        raw_diff = diff_response.content
+        max_size_bytes = config.max_file_size_mb * 1024 * 1024
+        diff_content = raw_diff[:max_size_bytes].decode("utf-8", errors="replace")
+        if len(raw_diff) > max_size_bytes:
+            diff_content += (
+                f"\n... [diff truncated: showing first {max_size_bytes:,} of {len(raw_diff):,} bytes]"
+            )
 
-        diff_content = diff_response.text
-        logger.info(f"Retrieved diff content: {len(diff_content)} characters")
+        logger.info("Retrieved diff content: %s characters", len(diff_content))
         return diff_content
 
     except Exception as e:
@@ -1099,6 +1505,36 @@ def get_commit_diff(repo: str, commit_sha: str) -> str:
         return error_msg
 
 
+def _compare_commits_data(repo: str, base_sha: str, head_sha: str) -> Dict[str, Any]:
+    """
+    Fetch one comparison and extract the fields returned by the compare tools.
+
+    Raises:
+        Exception: If the comparison cannot be retrieved or parsed
+    """
+    url = repo_url(repo, "compare", f"{base_sha}...{head_sha}")
+    response = github_api.make_request("GET", url)
+    comparison_data = _json_loads(response.content)
+
+    # Extract key comparison information
+    return {
+        "base_commit": {
+            "sha": comparison_data["base_commit"]["sha"],
+            "message": comparison_data["base_commit"]["commit"]["message"],
+        },
+        "head_commit": {
+            "sha": comparison_data["head_commit"]["sha"],
+            "message": comparison_data["head_commit"]["commit"]["message"],
+        },
+        "status": comparison_data["status"],
+        "ahead_by": comparison_data["ahead_by"],
+        "behind_by": comparison_data["behind_by"],
+        "total_commits": comparison_data["total_commits"],
+        "files": [_file_entry(file) for file in comparison_data["files"]],
+        "url": comparison_data["html_url"],
+    }
+
+
 def compare_commits(repo: str, base_sha: str, head_sha: str) -> str:
     """
     Compare two commits and show the differences.
@@ -1111,44 +1547,58 @@ def compare_commits(repo: str, base_sha: str, head_sha: str) -> str:
     Returns:
         JSON string with comparison details
     """
-    logger.info(f"Comparing commits in {repo}: {base_sha}...{head_sha}")
+    logger.info("Comparing commits in %s: %s...%s", repo, base_sha, head_sha)
 
     try:
-        url = f"{config.github_api_base_url}/repos/{repo}/compare/{base_sha}...{head_sha}"
-        response = github_api.make_request("GET", url)
-        comparison_data = response.json()
-
-        # Extract key comparison information
-        comparison = {
-            "base_commit": {
-                "sha": comparison_data["base_commit"]["sha"],
-                "message": comparison_data["base_commit"]["commit"]["message"],
-            },
-            "head_commit": {
-                "sha": comparison_data["head_commit"]["sha"],
-                "message": comparison_data["head_commit"]["commit"]["message"],
-            },
-            "status": comparison_data["status"],
-            "ahead_by": comparison_data["ahead_by"],
-            "behind_by": comparison_data["behind_by"],
-            "total_commits": comparison_data["total_commits"],
-            "files": [
-                {
-                    "filename": file["filename"],
-                    "status": file["status"],
-                    "additions": file["additions"],
-                    "deletions": file["deletions"],
-                    "changes": file["changes"],
-                }
-                for file in comparison_data["files"]
-            ],
-            "url": comparison_data["html_url"],
-        }
+        comparison = _compare_commits_data(repo, base_sha, head_sha)
 
         logger.info(
-            f"Comparison complete: {comparison['total_commits']} commits, {len(comparison['files'])} files"
+            "Comparison complete: %s commits, %s files",
+            comparison["total_commits"],
+            len(comparison["files"]),
         )
-        return json.dumps(comparison)
+        return _json_dumps(comparison)
+
+    except Exception as e:
+        error_msg = f"Error comparing commits: {str(e)}"
+        logger.error(error_msg)
+        return error_msg
+
+
+def compare_commits_batch(repo: str, pairs: List[Dict[str, str]]) -> str:
+    """
+    Compare several pairs of commits at once.
+
+    The comparisons are fetched concurrently, so N pairs cost roughly one round
+    trip instead of N.
+
+    Args:
+        repo: Repository name in format 'owner/repo'
+        pairs: List of {"base_sha": ..., "head_sha": ...} objects
+
+    Returns:
+        JSON string with one comparison (or error) per pair, in input order
+    """
+    if not pairs or not isinstance(pairs, list):
+        return "Error: pairs must be a non-empty list"
+
+    logger.info("Comparing %s commit pairs in %s", len(pairs), repo)
+
+    def compare(pair: Dict[str, str]) -> Dict[str, Any]:
+        if not isinstance(pair, dict):
+            return {"error": f"pair must be an object with base_sha and head_sha, got {pair!r}"}
+        base_sha, head_sha = pair.get("base_sha", ""), pair.get("head_sha", "")
+        try:
+            return _compare_commits_data(repo, base_sha, head_sha)
+        except Exception as e:
+            logger.error("Error comparing %s...%s: %s", base_sha, head_sha, e)
+            return {"base_sha": base_sha, "head_sha": head_sha, "error": str(e)}
+
+    try:
+        with ThreadPoolExecutor(max_workers=min(len(pairs), 8)) as executor:
+            comparisons = list(executor.map(compare, pairs))
+
+        return _json_dumps(comparisons)
 
     except Exception as e:
         error_msg = f"Error comparing commits: {str(e)}"
@@ -1168,10 +1618,10 @@ def create_repository(name: str, description: str = "", private: bool = False) -
     Returns:
         Repository URL or error message
     """
-    logger.info(f"Creating repository: {name} (private: {private})")
+    logger.info("Creating repository: %s (private: %s)", name, private)
 
     try:
-        url = f"{config.github_api_base_url}/user/repos"
+        url = api_url("user", "repos")
         data = {
             "name": name,
             "description": description,
@@ -1180,10 +1630,10 @@ def create_repository(name: str, description: str = "", private: bool = False) -
         }
 
         response = github_api.make_request("POST", url, data=data)
-        repo_data = response.json()
+        repo_data = _json_loads(response.content)
 
         repo_url = repo_data["html_url"]
-        logger.info(f"Repository created successfully: {repo_url}")
+        logger.info("Repository created successfully: %s", repo_url)
         return str(repo_url)
 
     except Exception as e:
@@ -1194,20 +1644,55 @@ def create_repository(name: str, description: str = "", private: bool = False) -
 
 def merge_pull_request(repo: str, pr_number: int, merge_method: str = "merge") -> str:
     """Merge a pull request."""
-    url = f"{config.github_api_base_url}/repos/{repo}/pulls/{pr_number}/merge"
+    url = repo_url(repo, "pulls", pr_number, "merge")
     data = {"merge_method": merge_method}
     github_api.make_request("PUT", url, data=data)
+    _invalidate_repo_bundle(repo)
     return f"Pull request #{pr_number} merged successfully in {repo}."
 
 
 def add_issue_comment(repo: str, issue_number: int, comment: str) -> str:
     """Add a comment to an issue or pull request."""
-    url = f"{config.github_api_base_url}/repos/{repo}/issues/{issue_number}/comments"
+    url = repo_url(repo, "issues", issue_number, "comments")
     data = {"body": comment}
     github_api.make_request("POST", url, data=data)
     return f"Comment added to issue #{issue_number} in {repo}."
 
 
+def add_issue_comments(repo: str, comments: List[Dict[str, Any]]) -> str:
+    """
+    Add several comments to issues or pull requests in one call.
+
+    Comments are posted one after another: GitHub's secondary rate limits penalize
+    concurrent content-creating requests.
+
+    Args:
+        repo: Repository name in format 'owner/repo'
+        comments: List of {"issue_number": ..., "comment": ...} objects
+
+    Returns:
+        One result line per comment, in input order
+    """
+    if not isinstance(comments, list):
+        return "Error: comments must be a list"
+
+    results = []
+    for position, item in enumerate(comments, start=1):
+        if not isinstance(item, dict):
+            results.append(f"Error: Comment {position} must be an object")
+            continue
+        issue_number = item.get("issue_number")
+        if issue_number is None:
+            results.append(f"Error: Comment {position} is missing 'issue_number'")
+            continue
+        try:
+            results.append(add_issue_comment(repo, issue_number, item.get("comment", "")))
+        except Exception as e:
+            logger.error("Error commenting on #%s in %s: %s", issue_number, repo, e)
+            results.append(f"Error adding comment to issue #{issue_number}: {str(e)}")
+    return "\n".join(results)
+
+
 def review_pull_request(
     repo: str,
     title: str,
@@ -1232,7 +1717,7 @@ def review_pull_request(
     Returns:
         JSON string with review results
     """
-    logger.info(f"Starting peer review for PR: {title} in {repo}")
+    logger.info("Starting peer review for PR: %s in %s", title, repo)
     
     try:
         # Create review context
@@ -1263,13 +1748,13 @@ def review_pull_request(
             "branch_name": branch_name
         }
         
-        logger.info(f"Peer review completed with decision: {decision.value}")
-        return json.dumps(review_result)
+        logger.info("Peer review completed with decision: %s", decision.value)
+        return _json_dumps(review_result)
         
     except Exception as e:
         error_msg = f"Error during peer review: {str(e)}"
         logger.error(error_msg)
-        return json.dumps({"error": error_msg})
+        return _json_dumps({"error": error_msg})
 
 
 def approve_pull_request(
@@ -1296,7 +1781,7 @@ def approve_pull_request(
     Returns:
         URL of the created pull request or error message
     """
-    logger.info(f"Approving and submitting PR: {title} in {repo}")
+    logger.info("Approving and submitting PR: %s in %s", title, repo)
     
     try:
         # Call create_pull_request with peer review disabled to avoid recursion
@@ -1311,7 +1796,7 @@ def approve_pull_request(
             enable_peer_review=False  # Disable peer review since we're already in review process
         )
         
-        logger.info(f"PR approved and submitted: {result}")
+        logger.info("PR approved and submitted: %s", result)
         return result
         
     except Exception as e:
@@ -1340,7 +1825,7 @@ def request_pr_changes(
     Returns:
         Formatted feedback for the original agent
     """
-    logger.info(f"Requesting changes for PR: {title} in {repo}")
+    logger.info("Requesting changes for PR: %s in %s", title, repo)
     
     try:
         # Format the change request
@@ -1355,17 +1840,17 @@ def request_pr_changes(
                 f"Peer review feedback for PR '{title}' in {repo}:\n\n"
                 f"**Feedback:** {feedback}\n\n"
                 f"**Suggestions:**\n"
-                + "\n".join(f"- {suggestion}" for suggestion in suggestions)
+                + "\n".join(["- " + suggestion for suggestion in suggestions])
             )
         }
         
-        logger.info(f"Change request created for iteration {current_iteration}")
-        return json.dumps(change_request)
+        logger.info("Change request created for iteration %s", current_iteration)
+        return _json_dumps(change_request)
         
     except Exception as e:
         error_msg = f"Error creating change request: {str(e)}"
         logger.error(error_msg)
-        return json.dumps({"error": error_msg})
+        return _json_dumps({"error": error_msg})
 
 
 def iterate_pull_request(
@@ -1395,7 +1880,7 @@ def iterate_pull_request(
     Returns:
         Result of the improved pull request creation
     """
-    logger.info(f"Iterating on PR: {title} in {repo}")
+    logger.info("Iterating on PR: %s in %s", title, repo)
     
     try:
         # Add feedback context to the PR description if provided
@@ -1411,10 +1896,11 @@ def iterate_pull_request(
             files=files,
             commit_message=commit_message,
             base_branch=base_branch,
-            enable_peer_review=True  # Always enable peer review for iterations
+            enable_peer_review=True,  # Always enable peer review for iterations
+            continue_review=True,
         )
         
-        logger.info(f"PR iteration completed: {result}")
+        logger.info("PR iteration completed: %s", result)
         return result
         
     except Exception as e:
@@ -1423,6 +1909,16 @@ def iterate_pull_request(
         return error_msg
 
 
+# File entry shared by the peer review tool schemas
+_FILE_ITEM_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "file_path": {"type": "string"},
+        "new_content": {"type": "string"},
+    },
+    "required": ["file_path", "new_content"],
+}
+
 # Tool definitions for the AI
 TOOLS = [
     {
@@ -1438,7 +1934,11 @@ TOOLS = [
                         "enum": ["all", "public", "private", "forks", "sources", "member"],
                         "description": "Type of repositories to list",
                         "default": "all",
-                    }
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "description": "Maximum number of repositories to return (default: all)",
+                    },
                 },
                 "required": [],
             },
@@ -1610,7 +2110,11 @@ TOOLS = [
                     "repo": {
                         "type": "string",
                         "description": "Repository name, e.g., username/repo",
-                    }
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "description": "Maximum number of branches to return (default: all)",
+                    },
                 },
                 "required": ["repo"],
             },
@@ -1689,6 +2193,10 @@ TOOLS = [
                         "description": "Labels for the issue (for create)",
                         "default": [],
                     },
+                    "limit": {
+                        "type": "integer",
+                        "description": "Maximum number of issues to return (for list, default: all)",
+                    },
                 },
                 "required": ["repo", "action"],
             },
@@ -1840,6 +2348,73 @@ TOOLS = [
             },
         },
     },
+    {
+        "type": "function",
+        "function": {
+            "name": "compare_commits_batch",
+            "description": (
+                "Compare several pairs of commits in one call. "
+                "Prefer this over repeated compare_commits calls."
+            ),
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "repo": {
+                        "type": "string",
+                        "description": "Repository name, e.g., username/repo",
+                    },
+                    "pairs": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "base_sha": {"type": "string", "description": "Base commit SHA"},
+                                "head_sha": {"type": "string", "description": "Head commit SHA"},
+                            },
+                            "required": ["base_sha", "head_sha"],
+                        },
+                        "description": "Commit pairs to compare",
+                    },
+                },
+                "required": ["repo", "pairs"],
+            },
+        },
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "add_issue_comments",
+            "description": (
+                "Add comments to several issues or pull requests in one call. "
+                "Prefer this over commenting on issues one at a time."
+            ),
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "repo": {
+                        "type": "string",
+                        "description": "Repository name, e.g., username/repo",
+                    },
+                    "comments": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "issue_number": {
+                                    "type": "integer",
+                                    "description": "Issue or pull request number",
+                                },
+                                "comment": {"type": "string", "description": "Comment text"},
+                            },
+                            "required": ["issue_number", "comment"],
+                        },
+                        "description": "Comments to post, in order",
+                    },
+                },
+                "required": ["repo", "comments"],
+            },
+        },
+    },
     {
         "type": "function",
         "function": {
@@ -1890,14 +2465,7 @@ TOOLS = [
                     "files": {
                         "type": "array",
                         "description": "List of files with their content",
-                        "items": {
-                            "type": "object",
-                            "properties": {
-                                "file_path": {"type": "string"},
-                                "new_content": {"type": "string"},
-                            },
-                            "required": ["file_path", "new_content"],
-                        },
+                        "items": _FILE_ITEM_SCHEMA,
                     },
                     "commit_message": {
                         "type": "string",
@@ -1940,14 +2508,7 @@ TOOLS = [
                     "files": {
                         "type": "array",
                         "description": "List of files with their content",
-                        "items": {
-                            "type": "object",
-                            "properties": {
-                                "file_path": {"type": "string"},
-                                "new_content": {"type": "string"},
-                            },
-                            "required": ["file_path", "new_content"],
-                        },
+                        "items": _FILE_ITEM_SCHEMA,
                     },
                     "commit_message": {
                         "type": "string",
@@ -2025,14 +2586,7 @@ TOOLS = [
                     "files": {
                         "type": "array",
                         "description": "Updated list of files with improvements based on peer review feedback",
-                        "items": {
-                            "type": "object",
-                            "properties": {
-                                "file_path": {"type": "string"},
-                                "new_content": {"type": "string"},
-                            },
-                            "required": ["file_path", "new_content"],
-                        },
+                        "items": _FILE_ITEM_SCHEMA,
                     },
                     "commit_message": {
                         "type": "string",
@@ -2078,9 +2632,11 @@ TOOL_FUNCTIONS = {
     "get_commit_details": get_commit_details,
     "get_commit_diff": get_commit_diff,
     "compare_commits": compare_commits,
+    "compare_commits_batch": compare_commits_batch,
     "create_repository": create_repository,
     "merge_pull_request": merge_pull_request,
     "add_issue_comment": add_issue_comment,
+    "add_issue_comments": add_issue_comments,
     "review_pull_request": review_pull_request,
     "approve_pull_request": approve_pull_request,
     "request_pr_changes": request_pr_changes,
@@ -1,9 +1,12 @@
 """
 Test configuration for Grok4Git tests.
 """
+import json
 import os
 import pytest
-from unittest.mock import patch
+import socket
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
 
 # Set up test environment variables before any imports
 os.environ.update({
@@ -21,20 +24,56 @@ os.environ.update({
     "TESTING": "true"  # Flag to indicate testing environment
 })
 
-@pytest.fixture(autouse=True)
+@pytest.fixture(autouse=True, scope="session")
 def setup_test_environment():
-    """Setup test environment for all tests."""
+    """Setup test environment once for the whole test session."""
     # Mock any interactive prompts to prevent them from running during tests
     with patch('rich.prompt.Prompt.ask') as mock_prompt, \
-         patch('rich.console.Console.print') as mock_print:
+         patch('rich.console.Console.print'):
         
         # Default prompt responses for testing
         mock_prompt.return_value = "n"  # Don't create .env file during tests
         
         yield
-        
-        # Cleanup after tests if needed
-        pass
+
+@pytest.fixture(autouse=True, scope="session")
+def block_network():
+    """Fail fast on any real connection or DNS lookup a test forgot to mock."""
+    def refuse(*args, **kwargs):
+        raise RuntimeError("Network access is disabled during tests")
+
+    with patch.object(socket.socket, "connect", refuse), \
+         patch.object(socket.socket, "connect_ex", refuse), \
+         patch.object(socket, "getaddrinfo", refuse):
+        yield
+
+@pytest.fixture(scope="session")
+def make_response():
+    """Build stub API responses whose .json() and .content carry the same payload."""
+    def make(payload):
+        return SimpleNamespace(json=lambda: payload, content=json.dumps(payload).encode())
+
+    return make
+
+@pytest.fixture
+def mock_github_api(monkeypatch):
+    """Replace the GitHub client used by the tools module for one test."""
+    mock_api = MagicMock()
+    monkeypatch.setattr("grok4git.tools.github_api", mock_api)
+    return mock_api
+
+@pytest.fixture
+def clear_repo_caches():
+    """Keep memoized repository lookups in the tools module from leaking between tests."""
+    from grok4git.tools import _default_branch, _repo_bundle_cache, _repo_push_ok
+
+    _default_branch.cache_clear()
+    _repo_push_ok.cache_clear()
+    _repo_bundle_cache.clear()
+    yield
+    _default_branch.cache_clear()
+    _repo_push_ok.cache_clear()
+    _repo_bundle_cache.clear()
 
 @pytest.fixture
 def mock_config():
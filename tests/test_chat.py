@@ -0,0 +1,75 @@
+"""
+Unit tests for the chat module.
+"""
+
+import pytest
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+from grok4git.chat import GrokChat
+from grok4git.config import config
+
+
+def _make_tool_call(name, arguments):
+    """Build a minimal stand-in for an OpenAI tool call object."""
+    return SimpleNamespace(function=SimpleNamespace(name=name, arguments=arguments))
+
+
+class TestConnectionWarmUp:
+    """Test the optional xAI connection warm-up."""
+
+    @pytest.mark.parametrize("enabled", [False, True])
+    def test_warm_up_is_opt_in(self, enabled):
+        """Test that the extra models request is only sent when enabled."""
+        chat = GrokChat()
+        chat.client = Mock()
+
+        with patch.object(config, "xai_connection_warmup", enabled), \
+             patch("grok4git.chat.threading.Thread") as mock_thread:
+            chat._warm_up_connection()
+
+        assert mock_thread.called is enabled
+        if enabled:
+            mock_thread.call_args.kwargs["target"]()
+            chat.client.models.list.assert_called_once()
+
+
+class TestToolExecution:
+    """Test execution of the tool calls in a model turn."""
+
+    @pytest.mark.parametrize("arguments", ["null", "[]"])
+    def test_non_object_arguments_become_error_results(self, arguments):
+        """Test that every call gets a result even if one call's arguments aren't an object."""
+        chat = GrokChat()
+        tool_calls = [
+            _make_tool_call("get_repo_info", '{"repo": "user/test-repo"}'),
+            _make_tool_call("get_file_content", arguments),
+        ]
+        tool_functions = {"get_repo_info": Mock(return_value="info"), "get_file_content": Mock()}
+
+        with patch.dict("grok4git.chat.TOOL_FUNCTIONS", tool_functions):
+            # Two read-only calls run concurrently, a single call runs serially
+            batch_results = chat._execute_tool_calls(tool_calls)
+            serial_results = chat._execute_tool_calls(tool_calls[1:])
+
+        error = "Error executing get_file_content: arguments must be a JSON object"
+        assert batch_results == ["info", error]
+        assert serial_results == [error]
+        tool_functions["get_file_content"].assert_not_called()
+
+    def test_concurrent_calls_check_for_unknown_tools(self):
+        """Test that the concurrent path reports unknown tools like the serial one."""
+        chat = GrokChat()
+        tool_calls = [
+            _make_tool_call("get_repo_info", '{"repo": "user/test-repo"}'),
+            _make_tool_call("get_file_content", '{"repo": "user/test-repo", "file_path": "a.py"}'),
+        ]
+
+        tool_functions = {"get_repo_info": Mock(return_value="info")}
+        with patch.dict("grok4git.chat.TOOL_FUNCTIONS", tool_functions, clear=True):
+            results = chat._execute_tool_calls(tool_calls)
+
+        assert results == ["info", "Error: Unknown function get_file_content"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -33,7 +33,7 @@ class TestCommand:
         assert cmd.category == CommandCategory.SYSTEM
         assert cmd.usage == "/test"
         assert cmd.examples == ["/test example"]
-        assert cmd.aliases == []  # Should be empty by default
+        assert cmd.aliases == ()  # Should be empty by default
 
     def test_command_with_aliases(self):
         """Test creating a command with aliases."""
@@ -43,10 +43,10 @@ class TestCommand:
             category=CommandCategory.SYSTEM,
             usage="/test",
             examples=["/test example"],
-            aliases=["t", "testing"],
+            aliases=("t", "testing"),
         )
 
-        assert cmd.aliases == ["t", "testing"]
+        assert cmd.aliases == ("t", "testing")
 
 
 class TestCommandRegistry:
@@ -101,6 +101,13 @@ class TestCommandRegistry:
         assert len(similar) <= 5  # Should return max 5
         assert "repo" in similar or "repos" in similar
 
+    def test_find_similar_commands_matches_substrings_in_order(self):
+        """Test that suggestions include mid-name matches, sorted and capped at five."""
+        registry = CommandRegistry()
+
+        assert registry.find_similar_commands("STATUS") == ["peer-review-status", "peer-status", "pr-review-status"]
+        assert registry.find_similar_commands("e") == sorted(n for n in registry.commands if "e" in n)[:5]
+
 
 class TestCommandParser:
     """Test the CommandParser class."""
@@ -137,6 +137,7 @@ class TestConfig:
         assert config.log_level == "DEBUG"
         assert config.max_file_size_mb == 1  # default value
         assert config.api_timeout == 30  # default value
+        assert config.xai_connection_warmup is False  # default value
 
     @patch.dict(
         os.environ,
@@ -160,6 +161,32 @@ class TestConfig:
         assert headers["Accept"] == "application/vnd.github+json"
         assert "X-GitHub-Api-Version" in headers
 
+    @patch.dict(
+        os.environ,
+        {
+            "XAI_API_KEY": "test_xai_key",
+            "GITHUB_TOKEN": "test_github_token",
+            "GITHUB_USERNAME": "test_user",
+            "ENABLE_PR_PEER_REVIEW": "yes",
+            "MAX_REVIEW_ITERATIONS": "5",
+        },
+    )
+    @patch("grok4git.config.os.path.exists")
+    @patch("grok4git.config.load_dotenv")
+    def test_typed_settings_reload(self, mock_load_dotenv, mock_exists):
+        """Test that typed settings are parsed once and refreshed on reload."""
+        mock_exists.return_value = True
+
+        config = Config()
+
+        assert config.pr_peer_review_enabled is True
+        assert config.max_review_iterations == 5
+
+        os.environ["ENABLE_PR_PEER_REVIEW"] = "off"
+        assert config.pr_peer_review_enabled is True
+        config.reload_settings()
+        assert config.pr_peer_review_enabled is False
+
     @pytest.mark.skip(reason="Interactive test - difficult to mock properly")
     @patch("grok4git.config.Prompt.ask")
     def test_config_optional_settings_configuration(self, mock_prompt, clean_environment):
@@ -2,11 +2,22 @@
 Unit tests for the github_api module.
 """
 
+import json
 import pytest
+import requests
 from unittest.mock import Mock, patch
 import grok4git.github_api as github_api
 
 
+def _response(status_code=200, payload=None, headers=None):
+    """Build a real Response with a JSON body, as the caches read its content."""
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    response._content = b"" if payload is None else json.dumps(payload).encode()
+    return response
+
+
 class TestGitHubAPI:
     """Test GitHub API utility functions."""
 
@@ -18,20 +29,10 @@ class TestGitHubAPI:
         assert hasattr(api_instance, "get_paginated_results")
         assert hasattr(api_instance, "get_default_branch")
 
-    def test_make_request_callable(self):
-        """Test that make_request is callable."""
-        api_instance = github_api.github_api
-        assert callable(api_instance.make_request)
-
-    def test_get_paginated_results_callable(self):
-        """Test that get_paginated_results is callable."""
-        api_instance = github_api.github_api
-        assert callable(api_instance.get_paginated_results)
-
-    def test_get_default_branch_callable(self):
-        """Test that get_default_branch is callable."""
-        api_instance = github_api.github_api
-        assert callable(api_instance.get_default_branch)
+    @pytest.mark.parametrize("method_name", ["make_request", "get_paginated_results", "get_default_branch"])
+    def test_client_method_is_callable(self, method_name):
+        """Test that each client method is callable."""
+        assert callable(getattr(github_api.github_api, method_name))
 
     @patch("grok4git.github_api.requests.Session")
     def test_session_creation(self, mock_session_class):
@@ -39,21 +40,298 @@ class TestGitHubAPI:
         mock_session = Mock()
         mock_session_class.return_value = mock_session
 
-        # Import should create session
-        import importlib
-
-        importlib.reload(github_api)
+        api_instance = github_api.GitHubAPI()
 
         # Verify session was created
-        mock_session_class.assert_called()
-
-        # Verify session has expected attributes
-        api_instance = github_api.github_api
-        assert hasattr(api_instance, "session")
+        mock_session_class.assert_called_once()
+        assert api_instance.session is mock_session
 
         # Test that session headers are set properly
         mock_session.headers.update.assert_called()
 
+        # Test that a pooled adapter is mounted for both schemes
+        mounted = [call.args[0] for call in mock_session.mount.call_args_list]
+        assert "https://" in mounted
+        assert "http://" in mounted
+
+    def test_get_paginated_results_reuses_prepared_request(self, monkeypatch):
+        """Test that pagination prepares the request once and only updates the URL."""
+        monkeypatch.setenv("REQUESTS_CA_BUNDLE", "/etc/ssl/corporate-ca.pem")
+        api_instance = github_api.GitHubAPI()
+        first_page = Mock(status_code=200, headers={})
+        first_page.json.return_value = [{"id": i} for i in range(100)]
+        second_page = Mock(status_code=200, headers={})
+        second_page.json.return_value = [{"id": 100}]
+
+        sent_urls = []
+        send_kwargs = []
+
+        def fake_send(prepared, **kwargs):
+            sent_urls.append(prepared.url)
+            send_kwargs.append(kwargs)
+            return first_page if len(sent_urls) == 1 else second_page
+
+        with patch.object(api_instance.session, "prepare_request", wraps=api_instance.session.prepare_request) as mock_prepare, \
+             patch.object(api_instance.session, "send", side_effect=fake_send):
+            items = api_instance.get_paginated_results("https://api.github.com/user/repos")
+
+        assert len(items) == 101
+        mock_prepare.assert_called_once()
+        assert "page=1" in sent_urls[0]
+        assert "page=2" in sent_urls[1]
+        # Environment settings apply as they do for Session.request
+        assert all(kw["verify"] == "/etc/ssl/corporate-ca.pem" for kw in send_kwargs)
+
+    def test_get_file_content_range_sends_range_header(self):
+        """Test that byte ranges are requested with the matching Range header."""
+        api_instance = github_api.GitHubAPI()
+        response = Mock(status_code=206, content="héllo".encode("utf-8")[:2])
+
+        with patch.object(api_instance.session, "get", return_value=response) as mock_get:
+            head = api_instance.get_file_content_range("user/repo", "big.txt", "main", 0, 1023)
+            api_instance.get_file_content_range("user/repo", "big.txt", "main", -512)
+
+        assert mock_get.call_args_list[0].kwargs["headers"] == {
+            "Range": "bytes=0-1023", "Accept-Encoding": "identity"
+        }
+        assert mock_get.call_args_list[1].kwargs["headers"]["Range"] == "bytes=-512"
+        assert mock_get.call_args_list[0].kwargs["stream"] is True
+        assert mock_get.call_args_list[0].args[0] == "https://raw.githubusercontent.com/user/repo/main/big.txt"
+        # A multi-byte character cut at the range edge does not raise
+        assert head == "h\ufffd"
+
+    def test_get_file_content_range_rejects_ignored_range(self):
+        """Test that a full 200 response is closed unread instead of downloaded."""
+        api_instance = github_api.GitHubAPI()
+        response = Mock(status_code=200)
+
+        with patch.object(api_instance.session, "get", return_value=response):
+            with pytest.raises(ValueError, match="ignored byte range"):
+                api_instance.get_file_content_range("user/repo", "big.txt", "main", 0, 1023)
+
+        response.close.assert_called_once()
+        # Mock only lists attributes that were accessed, so the body was never read
+        assert "content" not in dir(response)
+
+    def test_make_request_revalidates_with_etag(self):
+        """Test that repeated GETs send If-None-Match and reuse the cached body on 304."""
+        api_instance = github_api.GitHubAPI()
+        fresh = _response(200, {"name": "repo"}, {"ETag": '"abc"'})
+        not_modified = _response(304)
+
+        with patch.object(api_instance.session, "request", side_effect=[fresh, not_modified]) as mock_request:
+            api_instance.make_request("GET", "https://api.github.com/repos/user/repo")
+            second = api_instance.make_request("GET", "https://api.github.com/repos/user/repo")
+
+        assert mock_request.call_args_list[0].kwargs["headers"] == {}
+        assert mock_request.call_args_list[1].kwargs["headers"] == {"If-None-Match": '"abc"'}
+        assert second.status_code == 200
+        assert second.json() == {"name": "repo"}
+
+    def test_make_request_resends_when_cached_body_is_evicted(self):
+        """Test that a 304 whose cached body was evicted in flight triggers a plain refetch."""
+        api_instance = github_api.GitHubAPI()
+        url = "https://api.github.com/repos/user/repo"
+        cached = _response(200, {"name": "repo"}, {"ETag": '"abc"'})
+        refetched = _response(200, {"name": "renamed"}, {"ETag": '"def"'})
+        responses = iter([cached, _response(304), refetched])
+
+        def send(**kwargs):
+            response = next(responses)
+            if response.status_code == 304:
+                # Another thread evicts the entry while this request is in flight
+                api_instance._etag_cache = github_api._ByteBoundedCache(1024)
+            return response
+
+        with patch.object(api_instance.session, "request", side_effect=send) as mock_request:
+            api_instance.make_request("GET", url)
+            result = api_instance.make_request("GET", url)
+
+        assert mock_request.call_args_list[1].kwargs["headers"] == {"If-None-Match": '"abc"'}
+        assert mock_request.call_args_list[2].kwargs["headers"] == {}
+        assert result.json() == {"name": "renamed"}
+
+    def test_etag_cache_is_bounded_by_bytes(self):
+        """Test that the oldest bodies are evicted once the byte budget is exceeded."""
+        cache = github_api._ByteBoundedCache(max_bytes=10)
+        entry = github_api._CachedResponse('"e"', 200, {}, b"x" * 4, "")
+
+        for name in ("a", "b", "c"):
+            cache.put((name, (), ()), entry)
+        cache.put(("huge", (), ()), entry._replace(content=b"x" * 11))
+
+        assert cache.get(("a", (), ())) is None
+        assert cache.get(("c", (), ())) is entry
+        assert cache.get(("huge", (), ())) is None
+        assert cache.size == 8
+
+    def test_make_request_does_not_cache_writes(self):
+        """Test that non-GET requests bypass the conditional request cache."""
+        api_instance = github_api.GitHubAPI()
+        response = Mock(status_code=201, headers={"ETag": '"abc"'})
+
+        with patch.object(api_instance.session, "request", return_value=response) as mock_request:
+            api_instance.make_request("POST", "https://api.github.com/user/repos", data={"name": "x"})
+
+        assert mock_request.call_args.kwargs["headers"] is None
+        assert not api_instance._etag_cache
+
+    def test_graphql_returns_data_and_raises_on_errors(self):
+        """Test that GraphQL queries return the data object and surface errors."""
+        api_instance = github_api.GitHubAPI()
+        ok = Mock(status_code=200, headers={})
+        ok.json.return_value = {"data": {"viewer": {"login": "test_user"}}}
+        failed = Mock(status_code=200, headers={})
+        failed.json.return_value = {"errors": [{"message": "Bad query"}]}
+
+        with patch.object(api_instance.session, "request", side_effect=[ok, failed]) as mock_request:
+            assert api_instance.graphql("{ viewer { login } }") == {"viewer": {"login": "test_user"}}
+            with pytest.raises(ValueError, match="Bad query"):
+                api_instance.graphql("{ nope }")
+
+        assert mock_request.call_args_list[0].kwargs["url"].endswith("/graphql")
+        assert mock_request.call_args_list[0].kwargs["method"] == "POST"
+
+    def test_http_errors_carry_status_code(self):
+        """Test that failed requests raise GitHubHTTPError with the status code."""
+        import requests
+
+        api_instance = github_api.GitHubAPI()
+        response = requests.Response()
+        response.status_code = 404
+        response.url = "https://api.github.com/repos/user/missing"
+        response._content = b'{"message": "Not Found"}'
+
+        with patch.object(api_instance.session, "request", return_value=response):
+            with pytest.raises(github_api.GitHubHTTPError) as exc_info:
+                api_instance.make_request("GET", "https://api.github.com/repos/user/missing")
+
+        assert exc_info.value.status_code == 404
+        assert exc_info.value.url == "https://api.github.com/repos/user/missing"
+        assert "Not Found" in exc_info.value.body
+        assert "404 Client Error" in str(exc_info.value)
+        # Existing handlers for requests errors keep working
+        assert isinstance(exc_info.value, requests.exceptions.HTTPError)
+
+    def test_iter_paginated_results_fetches_pages_lazily(self):
+        """Test that pages are only requested as the iterator is consumed."""
+        api_instance = github_api.GitHubAPI()
+        first_page = Mock(status_code=200, headers={})
+        first_page.json.return_value = [{"id": i} for i in range(100)]
+        second_page = Mock(status_code=200, headers={})
+        second_page.json.return_value = [{"id": 100}]
+
+        with patch.object(api_instance.session, "send", side_effect=[first_page, second_page]) as mock_send:
+            items = api_instance.iter_paginated_results("https://api.github.com/user/repos")
+            assert next(items) == {"id": 0}
+            assert mock_send.call_count == 1
+            assert [item["id"] for item in items][-1] == 100
+
+        assert mock_send.call_count == 2
+
+    def test_iter_paginated_results_stops_at_limit(self):
+        """Test that a limit shrinks the page size and stops before fetching further pages."""
+        api_instance = github_api.GitHubAPI()
+        first_page = Mock(status_code=200, headers={})
+        first_page.json.return_value = [{"id": i} for i in range(5)]
+
+        with patch.object(api_instance.session, "send", side_effect=[first_page]) as mock_send:
+            items = api_instance.get_paginated_results("https://api.github.com/user/repos", limit=3)
+
+        assert [item["id"] for item in items] == [0, 1, 2]
+        assert mock_send.call_count == 1
+        assert "per_page=3" in mock_send.call_args.args[0].url
+
+    def test_make_request_caches_per_accept_header(self):
+        """Test that the same URL requested with a different Accept header is cached separately."""
+        api_instance = github_api.GitHubAPI()
+        sha = "b" * 40
+        url = f"https://api.github.com/repos/user/repo/commits/{sha}"
+        json_response = _response(200, {"sha": sha})
+        diff_response = _response(200, "diff --git a/x b/x")
+        diff_headers = {"Accept": "application/vnd.github.v3.diff"}
+
+        with patch.object(api_instance.session, "request", side_effect=[json_response, diff_response]) as mock_request:
+            assert api_instance.make_request("GET", url) is json_response
+            assert api_instance.make_request("GET", url, headers=diff_headers) is diff_response
+            cached = api_instance.make_request("GET", url, headers=diff_headers)
+
+        assert cached.content == diff_response.content
+
+        assert mock_request.call_count == 2
+        assert mock_request.call_args.kwargs["headers"] == diff_headers
+
+    def test_get_default_branch_uses_shared_request_path(self):
+        """Test that default branch lookups go through make_request (timeout, retries, ETags)."""
+        api_instance = github_api.GitHubAPI()
+        response = Mock(status_code=200, headers={})
+        response.json.return_value = {"default_branch": "develop"}
+
+        with patch.object(api_instance.session, "request", return_value=response) as mock_request:
+            assert api_instance.get_default_branch("user/repo") == "develop"
+
+        assert mock_request.call_args.kwargs["timeout"] == api_instance.timeout
+
+    def test_sha_addressed_resources_are_fetched_once(self):
+        """Test that commits addressed by a full SHA are served from cache after the first fetch."""
+        api_instance = github_api.GitHubAPI()
+        sha = "a" * 40
+        response = _response(200, {"sha": sha})
+        branch_response = _response(200, {"sha": "e" * 40})
+
+        with patch.object(api_instance.session, "request", side_effect=[response, branch_response, branch_response]) as mock_request:
+            for _ in range(3):
+                commit = api_instance.make_request("GET", f"https://api.github.com/repos/user/repo/commits/{sha}")
+                assert commit.json() == {"sha": sha}
+            # Branch names are mutable and always refetched
+            api_instance.make_request("GET", "https://api.github.com/repos/user/repo/commits/main")
+            api_instance.make_request("GET", "https://api.github.com/repos/user/repo/commits/main")
+
+        assert mock_request.call_count == 3
+
+    def test_compare_between_full_shas_is_fetched_once(self):
+        """Test that comparisons pinned to two full SHAs are cached, but not those naming a branch."""
+        api_instance = github_api.GitHubAPI()
+        base, head = "c" * 40, "d" * 40
+        response = _response(200, {"status": "ahead"})
+
+        with patch.object(api_instance.session, "request", return_value=response) as mock_request:
+            for _ in range(2):
+                api_instance.make_request("GET", f"https://api.github.com/repos/user/repo/compare/{base}...{head}")
+            for _ in range(2):
+                api_instance.make_request("GET", f"https://api.github.com/repos/user/repo/compare/{base}...main")
+
+        assert mock_request.call_count == 3
+
+
+    def test_immutable_cache_keeps_payload_not_response(self):
+        """Test that SHA-addressed entries hold the body bytes rather than the live Response."""
+        api_instance = github_api.GitHubAPI()
+        sha = "f" * 40
+        response = _response(200, {"sha": sha})
+
+        with patch.object(api_instance.session, "request", return_value=response):
+            api_instance.make_request("GET", f"https://api.github.com/repos/user/repo/git/trees/{sha}")
+
+        assert len(api_instance._immutable_cache) == 1
+        assert api_instance._immutable_cache.size == len(response.content)
+
+    def test_api_urls_join_path_segments(self):
+        """Test that API URLs are built from the precomputed prefixes and path segments."""
+        with patch.object(github_api, "_REPO_PREFIX", "https://api.github.com/repos/"):
+            assert github_api.repo_url("user/repo") == "https://api.github.com/repos/user/repo"
+            assert (
+                github_api.repo_url("user/repo", "contents", "src/app.py")
+                == "https://api.github.com/repos/user/repo/contents/src/app.py"
+            )
+            assert (
+                github_api.repo_url("user/repo", "issues", 7, "comments")
+                == "https://api.github.com/repos/user/repo/issues/7/comments"
+            )
+
+        with patch.object(github_api, "_API_BASE", "https://ghe.example.com/api/v3"):
+            assert github_api.api_url("user", "repos") == "https://ghe.example.com/api/v3/user/repos"
+
 
 if __name__ == "__main__":
     pytest.main([__file__])
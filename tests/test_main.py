@@ -0,0 +1,63 @@
+"""
+Unit tests for the main module.
+"""
+
+import pytest
+from unittest.mock import patch
+from grok4git import main as main_module
+
+
+class TestMain:
+    """Test command-line entry point behavior."""
+
+    def test_version_skips_argument_parser(self, capsys):
+        """Test that --version is answered without building the parser."""
+        with patch.object(main_module.sys, "argv", ["grok4git", "--version"]), \
+             patch.object(main_module, "setup_argument_parser") as mock_setup:
+            with pytest.raises(SystemExit) as exc_info:
+                main_module.main()
+
+        assert exc_info.value.code == 0
+        mock_setup.assert_not_called()
+        assert capsys.readouterr().out == f"{main_module.VERSION_STRING}\n"
+
+    @patch("grok4git.main._check_xai_connection")
+    @patch("grok4git.main._check_github_connection")
+    def test_configuration_runs_both_connectivity_checks(self, mock_github, mock_xai):
+        """Test that both connectivity checks run and results are combined."""
+        mock_github.return_value = "test_user"
+        mock_xai.side_effect = RuntimeError("xAI unavailable")
+
+        assert main_module.test_configuration() is False
+        mock_github.assert_called_once()
+        mock_xai.assert_called_once()
+
+        mock_xai.side_effect = None
+        mock_xai.return_value = 120.0
+        assert main_module.test_configuration() is True
+
+    @patch("grok4git.main._shutdown")
+    @patch("grok4git.main.test_configuration")
+    def test_config_test_exit_code(self, mock_test_configuration, mock_shutdown):
+        """Test that --config-test exits with the test result and still cleans up."""
+        mock_test_configuration.return_value = False
+
+        with patch.object(main_module.sys, "argv", ["grok4git", "--config-test"]):
+            with pytest.raises(SystemExit) as exc_info:
+                main_module.main()
+
+        assert exc_info.value.code == 1
+        mock_shutdown.assert_called_once()
+
+    @patch("grok4git.main._get_rich")
+    def test_configuration_missing_credentials_skips_rich(self, mock_get_rich, capsys):
+        """Test that missing credentials are reported before rich is loaded."""
+        with patch.dict(main_module.os.environ, {"GITHUB_TOKEN": ""}):
+            assert main_module.test_configuration() is False
+
+        mock_get_rich.assert_not_called()
+        assert "GITHUB_TOKEN" in capsys.readouterr().out
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,407 @@
+"""
+Unit tests for the peer_review module.
+"""
+
+import json
+import time
+import pytest
+from unittest.mock import Mock, patch
+from grok4git.peer_review import (
+    PeerReviewAgent,
+    PeerReviewOrchestrator,
+    PeerReviewResult,
+    ReviewDecision,
+    create_peer_review_context,
+)
+
+
+def _make_tool_call(call_id, name, arguments):
+    """Build a minimal stand-in for an OpenAI tool call object."""
+    tool_call = Mock()
+    tool_call.id = call_id
+    tool_call.function.name = name
+    tool_call.function.arguments = json.dumps(arguments)
+    return tool_call
+
+
+def _make_completion(content=None, tool_calls=None):
+    """Build a minimal stand-in for a chat completion response."""
+    message = Mock()
+    message.content = content
+    message.tool_calls = tool_calls
+    return Mock(choices=[Mock(message=message)])
+
+
+def _make_stream(content):
+    """Build a minimal stand-in for a streamed chat completion."""
+    chunks = []
+    for piece in (content[: len(content) // 2], content[len(content) // 2 :]):
+        chunk = Mock()
+        chunk.choices = [Mock()]
+        chunk.choices[0].delta.content = piece
+        chunks.append(chunk)
+    return iter(chunks)
+
+
+@pytest.fixture
+def review_context():
+    """Provide a small peer review context."""
+    return create_peer_review_context(
+        repo="user/test-repo",
+        title="Add feature",
+        body="Adds a feature",
+        files=[{"file_path": "src/app.py", "new_content": "print('hello')\n"}],
+        commit_message="Add feature",
+        branch_name="feature/add-feature",
+    )
+
+
+class TestPeerReviewResult:
+    """Test peer review result formatting."""
+
+    def test_request_changes_message(self):
+        """Test the agent message for requested changes."""
+        result = PeerReviewResult(
+            decision=ReviewDecision.REQUEST_CHANGES,
+            feedback="Needs tests",
+            suggestions=["Add unit tests", "Handle errors"],
+            should_proceed=False,
+            iteration_count=1,
+        )
+
+        assert result.to_agent_message() == (
+            "Peer review feedback (iteration 1):\n\n"
+            "**Feedback:** Needs tests\n\n"
+            "**Suggestions:**\n"
+            "1. Add unit tests\n"
+            "2. Handle errors\n"
+            "\nPlease implement these changes and create an updated pull request."
+        )
+
+    def test_major_revision_message(self):
+        """Test the agent message for major revisions."""
+        result = PeerReviewResult(
+            decision=ReviewDecision.NEEDS_MAJOR_REVISION,
+            feedback="Wrong approach",
+            suggestions=["Rework the design"],
+            should_proceed=False,
+            iteration_count=1,
+        )
+
+        message = result.to_agent_message()
+        assert message.startswith("Peer review identified major issues")
+        assert "**Critical Issues:**\n1. Rework the design\n" in message
+        assert message.endswith("Please address these fundamental issues.")
+
+
+class TestPeerReviewAgent:
+    """Test peer review agent behavior."""
+
+    def test_tool_results_keep_request_order(self, review_context):
+        """Test that concurrently executed tool results are appended in call order."""
+        agent = PeerReviewAgent()
+
+        def slow_tool(delay):
+            time.sleep(delay)
+            return f"slept {delay}"
+
+        tool_calls = [
+            _make_tool_call("call_1", "slow_tool", {"delay": 0.05}),
+            _make_tool_call("call_2", "missing_tool", {}),
+            _make_tool_call("call_3", "slow_tool", {"delay": 0}),
+        ]
+        review_json = json.dumps({"decision": "approve", "feedback": "Looks good", "suggestions": []})
+        agent.client = Mock()
+        agent.client.chat.completions.create.side_effect = [
+            _make_completion(tool_calls=tool_calls),
+            _make_stream(review_json),
+        ]
+
+        with patch.dict("grok4git.tools.TOOL_FUNCTIONS", {"slow_tool": slow_tool}):
+            decision, feedback, suggestions = agent.review_pull_request(review_context)
+
+        assert decision == ReviewDecision.APPROVE
+        assert all(isinstance(m, dict) for m in agent.messages)
+        assert agent.messages[3]["tool_calls"][0] == {
+            "id": "call_1",
+            "type": "function",
+            "function": {"name": "slow_tool", "arguments": json.dumps({"delay": 0.05})},
+        }
+        tool_messages = [m for m in agent.messages if m["role"] == "tool"]
+        assert [m["tool_call_id"] for m in tool_messages] == ["call_1", "call_2", "call_3"]
+        assert tool_messages[0]["content"] == "slept 0.05"
+        assert tool_messages[1]["content"] == "Error: Unknown tool missing_tool"
+        assert agent.messages[-1] == {"role": "assistant", "content": review_json}
+
+    def test_read_only_tool_results_are_cached(self):
+        """Test that repeated read-only tool calls reuse the first result."""
+        agent = PeerReviewAgent()
+        get_file_content = Mock(return_value="file body")
+        tool_functions = {"get_file_content": get_file_content}
+        tool_call = _make_tool_call("call_1", "get_file_content", {"repo": "user/repo", "path": "a.py"})
+
+        assert agent._run_tool_call(tool_call, tool_functions) == "file body"
+        assert agent._run_tool_call(tool_call, tool_functions) == "file body"
+        get_file_content.assert_called_once()
+
+        # A new review session does not share the cache
+        PeerReviewAgent()._run_tool_call(tool_call, tool_functions)
+        assert get_file_content.call_count == 2
+
+    def test_identical_read_only_tool_calls_run_once(self, review_context):
+        """Test that duplicate read-only calls in one batch share a single execution."""
+        agent = PeerReviewAgent()
+        get_file_content = Mock(return_value="file body")
+        create_issue = Mock(return_value="created")
+        arguments = {"repo": "user/test-repo", "file_path": "a.py"}
+        tool_calls = [
+            _make_tool_call("call_1", "get_file_content", arguments),
+            _make_tool_call("call_2", "get_file_content", arguments),
+            _make_tool_call("call_3", "create_issue", {}),
+            _make_tool_call("call_4", "create_issue", {}),
+        ]
+        review_json = json.dumps({"decision": "approve", "feedback": "Fine", "suggestions": []})
+        agent.client = Mock()
+        agent.client.chat.completions.create.side_effect = [
+            _make_completion(tool_calls=tool_calls),
+            _make_stream(review_json),
+        ]
+        tool_functions = {"get_file_content": get_file_content, "create_issue": create_issue}
+
+        with patch.dict("grok4git.tools.TOOL_FUNCTIONS", tool_functions):
+            agent.review_pull_request(review_context)
+
+        get_file_content.assert_called_once_with(**arguments)
+        assert create_issue.call_count == 2
+        tool_messages = [m for m in agent.messages if m["role"] == "tool"]
+        assert [m["tool_call_id"] for m in tool_messages] == [
+            "call_1", "call_2", "call_3", "call_4"
+        ]
+        assert [m["content"] for m in tool_messages[:2]] == ["file body", "file body"]
+
+    def test_static_context_sent_once(self, review_context):
+        """Test that repository and file context is only sent on the first iteration."""
+        agent = PeerReviewAgent()
+        review_json = json.dumps(
+            {"decision": "request_changes", "feedback": "Add tests", "suggestions": ["Add tests"]}
+        )
+        agent.client = Mock()
+        agent.client.chat.completions.create.side_effect = [
+            _make_completion(content=review_json),
+            _make_completion(content=review_json),
+        ]
+
+        for _ in range(2):
+            decision, feedback, suggestions = agent.review_pull_request(review_context)
+            review_context.add_review_iteration(decision, feedback, suggestions)
+
+        user_messages = [m["content"] for m in agent.messages if isinstance(m, dict) and m["role"] == "user"]
+        assert sum("**Files Changed:**" in m for m in user_messages) == 1
+        assert sum("**Review History:**" in m for m in user_messages) == 2
+        assert "Iteration 0: request_changes" in user_messages[-1]
+
+    def test_failed_review_is_retried_with_full_context(self, review_context):
+        """Test that a review whose completion failed leaves no trace in the conversation."""
+        agent = PeerReviewAgent()
+        review_json = json.dumps({"decision": "approve", "feedback": "Fine", "suggestions": []})
+        agent.client = Mock()
+        agent.client.chat.completions.create.side_effect = [
+            RuntimeError("connection reset"),
+            _make_completion(content=review_json),
+        ]
+
+        assert agent.review_pull_request(review_context)[0] == ReviewDecision.APPROVE
+        assert len(agent.messages) == 1
+        assert not agent._static_context_sent
+
+        agent.review_pull_request(review_context)
+
+        user_messages = [m["content"] for m in agent.messages if m["role"] == "user"]
+        assert len(user_messages) == 2
+        assert "**Files Changed:**" in user_messages[0]
+        assert agent._static_context_sent
+
+    def test_follow_up_iteration_sends_only_changed_files(self, review_context):
+        """Test that later iterations append a diff of changed files instead of the full context."""
+        agent = PeerReviewAgent()
+        review_json = json.dumps(
+            {"decision": "request_changes", "feedback": "Add tests", "suggestions": ["Add tests"]}
+        )
+        agent.client = Mock()
+        agent.client.chat.completions.create.return_value = _make_completion(content=review_json)
+        review_context.files.append({"file_path": "src/util.py", "new_content": "x = 1\n"})
+
+        agent.review_pull_request(review_context)
+        review_context.files[0] = {"file_path": "src/app.py", "new_content": "print('hello world')\n"}
+        agent.review_pull_request(review_context)
+
+        last_request = agent.messages[-2]["content"]
+        assert last_request.startswith("\n**Updated Files:**")
+        assert "-print('hello')\n+print('hello world')" in last_request
+        assert "src/util.py" not in last_request
+        assert "**Review History:**" in last_request
+
+        agent.review_pull_request(review_context)
+        assert "**Updated Files:**" not in agent.messages[-2]["content"]
+
+    def test_requests_json_object_responses(self, review_context):
+        """Test that review completions ask for a JSON object response."""
+        agent = PeerReviewAgent()
+        agent.client = Mock()
+        agent.client.chat.completions.create.return_value = _make_completion(
+            content=json.dumps({"decision": "approve", "feedback": "Fine", "suggestions": []})
+        )
+
+        agent.review_pull_request(review_context)
+
+        kwargs = agent.client.chat.completions.create.call_args.kwargs
+        assert kwargs["response_format"] == {"type": "json_object"}
+
+    def test_parse_review_response_plain_json(self):
+        """Test parsing a plain JSON review."""
+        agent = PeerReviewAgent()
+
+        decision, feedback, suggestions = agent._parse_review_response(
+            json.dumps({"decision": "request_changes", "feedback": "Fix it", "suggestions": ["A"]})
+        )
+
+        assert decision == ReviewDecision.REQUEST_CHANGES
+        assert feedback == "Fix it"
+        assert suggestions == ["A"]
+
+    def test_duplicate_file_contents_sent_once(self, review_context):
+        """Test that identical file bodies are inlined once and copies point at the first path."""
+        agent = PeerReviewAgent()
+        review_context.files.append({"file_path": "src/copy.py", "new_content": "print('hello')\n"})
+
+        static_context = agent._format_static_context(review_context)
+
+        assert static_context.count("print('hello')") == 1
+        assert "**File: src/copy.py** (identical to `src/app.py`)" in static_context
+        # Rendering again (e.g. after a reset) still inlines the first body
+        assert agent._format_static_context(review_context) == static_context
+
+    def test_static_context_starts_with_pr_header(self, review_context):
+        """Test that the full review context leads with the PR header and then the files."""
+        agent = PeerReviewAgent()
+
+        static_context = agent._format_static_context(review_context)
+        section = review_context.get_static_section()
+
+        assert static_context.startswith(section)
+        assert "**Repository:** user/test-repo" in section
+        assert static_context[len(section):].startswith("**File: src/app.py**")
+
+    def test_compact_if_needed_summarizes_older_messages(self):
+        """Test that older messages are summarized once the budget is exceeded."""
+        agent = PeerReviewAgent()
+        agent.context_token_budget = 100
+        agent.messages.extend(
+            [
+                {"role": "user", "content": "x" * 400},
+                {"role": "assistant", "content": "first review"},
+                {"role": "user", "content": "second request"},
+                {"role": "assistant", "content": None, "tool_calls": []},
+                {"role": "tool", "content": "tool output", "tool_call_id": "call_1"},
+            ]
+        )
+        agent.client = Mock()
+        agent.client.chat.completions.create.return_value = _make_completion(content="Summary")
+
+        agent._compact_if_needed()
+
+        assert agent.messages[0]["role"] == "system"
+        assert agent.messages[1]["content"].endswith("Summary")
+        # The kept tail starts at the assistant message that owns the tool result
+        assert [m["role"] for m in agent.messages[2:]] == ["user", "assistant", "tool"]
+
+    def test_review_compacts_after_large_tool_results(self, review_context):
+        """Test that the budget is checked before the completion that follows tool results."""
+        agent = PeerReviewAgent()
+        agent.context_token_budget = 1000
+        review_json = json.dumps({"decision": "approve", "feedback": "Fine", "suggestions": []})
+        agent.client = Mock()
+        agent.client.chat.completions.create.side_effect = [
+            _make_completion(tool_calls=[_make_tool_call("call_1", "big_tool", {})]),
+            _make_completion(content="Summary"),
+            _make_stream(review_json),
+        ]
+
+        with patch.dict("grok4git.tools.TOOL_FUNCTIONS", {"big_tool": lambda: "x" * 4000}):
+            assert agent.review_pull_request(review_context)[0] == ReviewDecision.APPROVE
+
+        assert agent.messages[1]["content"].endswith("Summary")
+        # The file bodies were summarized away, so the next iteration sends them again
+        assert not agent._static_context_sent
+        agent.client.chat.completions.create.side_effect = None
+        agent.client.chat.completions.create.return_value = _make_completion(content=review_json)
+        agent.context_token_budget = 100000
+        agent.review_pull_request(review_context)
+        assert "**Files Changed:**" in agent.messages[-3]["content"]
+
+    def test_compact_if_needed_noop_under_budget(self):
+        """Test that small conversations are left untouched."""
+        agent = PeerReviewAgent()
+        agent.client = Mock()
+        agent.messages.append({"role": "user", "content": "short"})
+
+        agent._compact_if_needed()
+
+        agent.client.chat.completions.create.assert_not_called()
+        assert len(agent.messages) == 2
+
+    def test_parse_review_response_keyword_fallback(self):
+        """Test that unparseable reviews fall back to keyword matching."""
+        agent = PeerReviewAgent()
+
+        assert agent._parse_review_response("This needs a Major rework")[0] == (
+            ReviewDecision.NEEDS_MAJOR_REVISION
+        )
+        assert agent._parse_review_response("A few Changes are needed")[0] == (
+            ReviewDecision.REQUEST_CHANGES
+        )
+        assert agent._parse_review_response("Looks great")[0] == ReviewDecision.APPROVE
+
+
+class TestPeerReviewOrchestrator:
+    """Test peer review orchestration."""
+
+    def test_peer_agent_created_lazily(self):
+        """Test that the review agent is only created when first accessed."""
+        with patch("grok4git.peer_review.PeerReviewAgent") as mock_agent_class:
+            orchestrator = PeerReviewOrchestrator()
+            mock_agent_class.assert_not_called()
+
+            assert orchestrator.peer_agent is orchestrator.peer_agent
+            mock_agent_class.assert_called_once()
+
+    def test_orchestrate_review_disabled_by_zero_iterations(self, review_context):
+        """Test that zero configured iterations approves without creating an agent."""
+        orchestrator = PeerReviewOrchestrator()
+        orchestrator.console = Mock()
+
+        with patch("grok4git.peer_review.config") as mock_config, \
+             patch("grok4git.peer_review.PeerReviewAgent") as mock_agent_class:
+            mock_config.max_review_iterations = 0
+            result = orchestrator.orchestrate_review(review_context)
+
+        assert result.decision == ReviewDecision.APPROVE
+        assert result.should_proceed is True
+        assert result.iteration_count == 0
+        mock_agent_class.assert_not_called()
+        orchestrator.console.print.assert_not_called()
+
+    def test_suggestions_printed_in_one_call(self):
+        """Test that the suggestion list is rendered with a single console print."""
+        orchestrator = PeerReviewOrchestrator()
+        orchestrator.console = Mock()
+
+        orchestrator._display_review_results(ReviewDecision.REQUEST_CHANGES, "Fix", ["A", "B", "C"])
+
+        printed = [c.args[0] for c in orchestrator.console.print.call_args_list if c.args]
+        suggestion_prints = [p for p in printed if isinstance(p, str) and "Suggestions" in p]
+        assert suggestion_prints == ["[bold]💡 Suggestions:[/bold]\n  1. A\n  2. B\n  3. C"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
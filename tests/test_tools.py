@@ -1,47 +1,81 @@
 """
 Unit tests for the tools module.
+
+Every test gets its own mocked GitHub client through the function-scoped
+``mock_github_api`` fixture, so tests are independent and safe to run in
+parallel with ``pytest -n auto``.
 """
 
 import pytest
 import json
+from types import SimpleNamespace
 from unittest.mock import Mock, patch
+from grok4git.config import config
+from grok4git.github_api import GitHubHTTPError
 from grok4git.tools import (
+    TOOL_FUNCTIONS,
+    TOOLS,
+    _create_files_in_empty_repo,
+    _get_large_file_summary,
+    _looks_binary,
+    _repo_bundle_cache,
     list_github_repos,
     get_repo_info,
     get_file_content,
+    add_issue_comments,
+    compare_commits_batch,
     create_pull_request,
+    get_commit_details,
+    get_commit_diff,
+    get_commit_history,
+    iterate_pull_request,
     list_repo_branches,
     manage_issues,
+    recursive_list_directory,
+    search_github_repos,
 )
 
+pytestmark = pytest.mark.usefixtures("clear_repo_caches")
 
-class TestGitHubTools:
-    """Test GitHub tool functions."""
-
-    def test_list_github_repos_callable(self):
-        """Test that list_github_repos is callable."""
-        assert callable(list_github_repos)
+_REPOS_PAYLOAD = (
+    {"full_name": "user/repo1", "private": False},
+    {"full_name": "user/repo2", "private": True},
+)
+_REPO_INFO_PAYLOAD = {
+    "full_name": "user/test-repo",
+    "description": "Test repository",
+    "stargazers_count": 42,
+    "forks_count": 7,
+    "open_issues_count": 3,
+    "default_branch": "main",
+    "language": "Python",
+    "created_at": "2023-01-01T00:00:00Z",
+    "updated_at": "2023-12-01T00:00:00Z",
+    "html_url": "https://github.com/user/test-repo",
+}
+_HELLO_FILE_PAYLOAD = {"content": "aGVsbG8gd29ybGQ=", "encoding": "base64"}  # "hello world"
+_BRANCHES_PAYLOAD = ({"name": "main"}, {"name": "develop"}, {"name": "feature/test"})
+_ISSUES_PAYLOAD = (
+    {"number": 1, "title": "Bug report"},
+    {"number": 2, "title": "Feature request"},
+)
 
-    def test_get_repo_info_callable(self):
-        """Test that get_repo_info is callable."""
-        assert callable(get_repo_info)
 
-    def test_get_file_content_callable(self):
-        """Test that get_file_content is callable."""
-        assert callable(get_file_content)
+class TestGitHubTools:
+    """Test GitHub tool functions."""
 
-    def test_create_pull_request_callable(self):
-        """Test that create_pull_request is callable."""
-        assert callable(create_pull_request)
+    @pytest.mark.parametrize(
+        "tool_function",
+        [list_github_repos, get_repo_info, get_file_content, create_pull_request, list_repo_branches, manage_issues],
+    )
+    def test_tool_is_callable(self, tool_function):
+        """Test that each tool function is callable."""
+        assert callable(tool_function)
 
-    @patch("grok4git.tools.github_api")
-    def test_list_github_repos_success(self, mock_api):
+    def test_list_github_repos_success(self, mock_github_api):
         """Test successful repository listing."""
         # Mock successful API response
-        mock_api.get_paginated_results.return_value = [
-            {"full_name": "user/repo1", "private": False},
-            {"full_name": "user/repo2", "private": True},
-        ]
+        mock_github_api.iter_paginated_results.return_value = _REPOS_PAYLOAD
 
         result = list_github_repos()
         parsed_result = json.loads(result)
@@ -51,24 +85,12 @@ class TestGitHubTools:
         assert "user/repo1" in parsed_result
         assert "user/repo2" in parsed_result
 
-    @patch("grok4git.tools.github_api")
-    def test_get_repo_info_success(self, mock_api):
+    def test_get_repo_info_success(self, mock_github_api, make_response):
         """Test successful repository info retrieval."""
         # Mock successful API response
-        mock_response = Mock()
-        mock_response.json.return_value = {
-            "full_name": "user/test-repo",
-            "description": "Test repository",
-            "stargazers_count": 42,
-            "forks_count": 7,
-            "open_issues_count": 3,
-            "default_branch": "main",
-            "language": "Python",
-            "created_at": "2023-01-01T00:00:00Z",
-            "updated_at": "2023-12-01T00:00:00Z",
-            "html_url": "https://github.com/user/test-repo",
-        }
-        mock_api.make_request.return_value = mock_response
+        mock_response = make_response(_REPO_INFO_PAYLOAD)
+        mock_github_api.make_request.return_value = mock_response
+        mock_github_api.graphql.side_effect = ValueError("GraphQL unavailable")
 
         result = get_repo_info("user/test-repo")
         parsed_result = json.loads(result)
@@ -78,30 +100,209 @@ class TestGitHubTools:
         assert parsed_result["forks"] == 7
         assert parsed_result["language"] == "Python"
 
-    @patch("grok4git.tools.github_api")
-    def test_get_file_content_success(self, mock_api):
+    def test_get_file_content_success(self, mock_github_api, make_response):
         """Test successful file content retrieval."""
         # Mock successful API response
-        mock_response = Mock()
-        mock_response.json.return_value = {
-            "content": "aGVsbG8gd29ybGQ=",  # base64 encoded "hello world"
-            "encoding": "base64",
-        }
-        mock_api.make_request.return_value = mock_response
+        mock_response = make_response(_HELLO_FILE_PAYLOAD)
+        mock_github_api.make_request.return_value = mock_response
 
         result = get_file_content("user/test-repo", "README.md")
 
         assert "hello world" in result
 
-    @patch("grok4git.tools.github_api")
-    def test_list_repo_branches_success(self, mock_api):
+    def test_default_branch_is_memoized(self, mock_github_api, make_response):
+        """Test that the default branch is looked up once per repository."""
+        mock_github_api.get_default_branch.return_value = "main"
+        mock_response = make_response(_HELLO_FILE_PAYLOAD)
+        mock_github_api.make_request.return_value = mock_response
+
+        get_file_content("user/test-repo", "README.md")
+        get_file_content("user/test-repo", "setup.py")
+
+        mock_github_api.get_default_branch.assert_called_once_with("user/test-repo")
+
+    def test_recursive_list_directory_single_tree_request(self, mock_github_api, make_response):
+        """Test that the recursive listing is built from one Git Trees API call."""
+        mock_response = make_response({
+            "truncated": False,
+            "tree": [
+                {"path": "README.md", "type": "blob"},
+                {"path": "src", "type": "tree"},
+                {"path": "src/pkg", "type": "tree"},
+                {"path": "src/pkg/app.py", "type": "blob"},
+                {"path": "src/main.py", "type": "blob"},
+            ],
+        })
+        mock_github_api.make_request.return_value = mock_response
+
+        result = json.loads(recursive_list_directory("user/test-repo", "src", "main"))
+
+        mock_github_api.make_request.assert_called_once()
+        assert mock_github_api.make_request.call_args.args[1].endswith("/repos/user/test-repo/git/trees/main")
+        assert result == [
+            {"name": "main.py", "type": "file", "path": "src/main.py"},
+            {
+                "name": "pkg",
+                "type": "dir",
+                "path": "src/pkg",
+                "contents": [{"name": "app.py", "type": "file", "path": "src/pkg/app.py"}],
+            },
+        ]
+
+    def test_recursive_list_directory_truncated_tree_falls_back(self, mock_github_api, make_response):
+        """Test that a truncated tree falls back to walking the Contents API."""
+        tree_response = make_response({"truncated": True, "tree": []})
+        contents_response = make_response([{"name": "a.py", "type": "file", "path": "a.py"}])
+        mock_github_api.make_request.side_effect = [tree_response, contents_response]
+
+        result = json.loads(recursive_list_directory("user/test-repo", "", "main"))
+
+        assert result == [{"name": "a.py", "type": "file", "path": "a.py"}]
+        assert "/contents/" in mock_github_api.make_request.call_args.args[1]
+
+    def test_recursive_list_directory_fallback_walks_levels(self, mock_github_api):
+        """Test that the fallback walk rebuilds nested directories level by level."""
+        listings = {
+            "": [{"name": "src", "type": "dir", "path": "src"}, {"name": "a.py", "type": "file", "path": "a.py"}],
+            "src": [{"name": "pkg", "type": "dir", "path": "src/pkg"}],
+            "src/pkg": [{"name": "b.py", "type": "file", "path": "src/pkg/b.py"}],
+        }
+
+        def fake_request(method, url, data=None, params=None):
+            if "/git/trees/" in url:
+                raise ValueError("tree unavailable")
+            dir_path = url.split("/contents/", 1)[1]
+            return SimpleNamespace(content=json.dumps(listings[dir_path]).encode())
+
+        mock_github_api.make_request.side_effect = fake_request
+
+        result = json.loads(recursive_list_directory("user/test-repo", "", "main"))
+
+        assert result == [
+            {
+                "name": "src",
+                "type": "dir",
+                "path": "src",
+                "contents": [
+                    {
+                        "name": "pkg",
+                        "type": "dir",
+                        "path": "src/pkg",
+                        "contents": [{"name": "b.py", "type": "file", "path": "src/pkg/b.py"}],
+                    }
+                ],
+            },
+            {"name": "a.py", "type": "file", "path": "a.py"},
+        ]
+
+    def test_create_files_in_empty_repo_single_follow_up_commit(self, mock_github_api, make_response):
+        """Test that files after the first are added in one tree and commit."""
+        put_response = make_response({"commit": {"sha": "c1", "tree": {"sha": "t1"}}})
+        tree_response = make_response({"sha": "t2"})
+        commit_response = make_response({"sha": "c2"})
+        mock_github_api.make_request.side_effect = [put_response, tree_response, commit_response, Mock()]
+        files = [{"file_path": f"file{i}.txt", "new_content": f"content {i}"} for i in range(5)]
+
+        result = _create_files_in_empty_repo("user/test-repo", files, "init")
+
+        assert "successfully" in result
+        methods = [c.args[0] for c in mock_github_api.make_request.call_args_list]
+        assert methods == ["PUT", "POST", "POST", "PATCH"]
+        tree_data = mock_github_api.make_request.call_args_list[1].kwargs["data"]
+        assert tree_data["base_tree"] == "t1"
+        assert [item["path"] for item in tree_data["tree"]] == [f"file{i}.txt" for i in range(1, 5)]
+        assert mock_github_api.make_request.call_args_list[3].kwargs["data"] == {"sha": "c2"}
+
+    def test_large_file_summary_fetches_head_and_tail_only(self, mock_github_api):
+        """Test that large file summaries are built from two byte-range requests."""
+        head = "".join(f"line {i}\n" for i in range(100)) + "partial"
+        tail = "tial\n" + "".join(f"end {i}\n" for i in range(30))
+        mock_github_api.get_file_content_range.side_effect = [head, tail]
+
+        summary = _get_large_file_summary("user/test-repo", "big.log", "main", 10_000_000)
+
+        mock_github_api.get_file_content_raw.assert_not_called()
+        assert mock_github_api.get_file_content_range.call_count == 2
+        assert "line 49\n" in summary and "line 50\n" not in summary
+        assert "end 29" in summary and "end 9\n" not in summary
+        assert "partial" not in summary and "tial" not in summary
+        assert "(estimated)" in summary
+
+    def test_repo_inspection_tools_share_one_graphql_bundle(self, mock_github_api):
+        """Test that repo info, branches and recent commits come from one GraphQL request."""
+        mock_github_api.graphql.return_value = {
+            "repository": {
+                "nameWithOwner": "user/test-repo",
+                "description": "Test repository",
+                "stargazerCount": 42,
+                "forkCount": 7,
+                "issues": {"totalCount": 2},
+                "pullRequests": {"totalCount": 1},
+                "primaryLanguage": {"name": "Python"},
+                "createdAt": "2023-01-01T00:00:00Z",
+                "updatedAt": "2023-12-01T00:00:00Z",
+                "url": "https://github.com/user/test-repo",
+                "defaultBranchRef": {
+                    "name": "main",
+                    "target": {
+                        "history": {
+                            "nodes": [
+                                {"oid": "abc", "message": "Init", "author": {"name": "Dev", "date": "2023-01-01T00:00:00Z"}},
+                                {"oid": "def", "message": "Next", "author": {"name": "Dev", "date": "2023-01-02T00:00:00Z"}},
+                            ]
+                        }
+                    },
+                },
+                "refs": {"pageInfo": {"hasNextPage": False}, "nodes": [{"name": "main"}, {"name": "dev"}]},
+            }
+        }
+
+        info = json.loads(get_repo_info("user/test-repo"))
+        branches = json.loads(list_repo_branches("user/test-repo"))
+        commits = json.loads(get_commit_history("user/test-repo", max_commits=1))
+
+        mock_github_api.graphql.assert_called_once()
+        mock_github_api.make_request.assert_not_called()
+        mock_github_api.iter_paginated_results.assert_not_called()
+        assert info["stars"] == 42
+        assert info["open_issues"] == 3
+        assert info["default_branch"] == "main"
+        assert branches == ["main", "dev"]
+        assert commits == [{"sha": "abc", "message": "Init", "author": "Dev", "date": "2023-01-01T00:00:00Z"}]
+
+    def test_repo_info_falls_back_to_rest_when_graphql_fails(self, mock_github_api, make_response):
+        """Test that GraphQL failures fall back to the REST endpoint."""
+        mock_github_api.graphql.side_effect = ValueError("GraphQL query failed")
+        mock_response = make_response({"full_name": "user/test-repo", "stargazers_count": 5})
+        mock_github_api.make_request.return_value = mock_response
+
+        info = json.loads(get_repo_info("user/test-repo"))
+
+        assert info["full_name"] == "user/test-repo"
+        assert info["stars"] == 5
+
+    def test_search_query_is_not_pre_encoded(self, mock_github_api):
+        """Test that the search query is passed raw so requests encodes it once."""
+        mock_github_api.get_paginated_results.return_value = []
+
+        search_github_repos("def main")
+
+        params = mock_github_api.get_paginated_results.call_args.args[1]
+        assert params == {"q": f"def main user:{config.github_username}"}
+
+    def test_looks_binary_sniffs_file_head(self):
+        """Test binary detection from the first bytes of a file."""
+        assert _looks_binary(b"\x89PNG\r\n\x1a\n\0\0\0\rIHDR")
+        assert _looks_binary(b"\xff\xfe invalid utf-8")
+        assert not _looks_binary("héllo".encode("utf-8"))
+        # A multi-byte character split at the sniff boundary is not binary
+        assert not _looks_binary(("a" * 4095 + "é").encode("utf-8"))
+
+    def test_list_repo_branches_success(self, mock_github_api):
         """Test successful branch listing."""
         # Mock successful API response
-        mock_api.get_paginated_results.return_value = [
-            {"name": "main"},
-            {"name": "develop"},
-            {"name": "feature/test"},
-        ]
+        mock_github_api.iter_paginated_results.return_value = _BRANCHES_PAYLOAD
+        mock_github_api.graphql.side_effect = ValueError("GraphQL unavailable")
 
         result = list_repo_branches("user/test-repo")
         parsed_result = json.loads(result)
@@ -112,14 +313,10 @@ class TestGitHubTools:
         assert "develop" in parsed_result
         assert "feature/test" in parsed_result
 
-    @patch("grok4git.tools.github_api")
-    def test_manage_issues_list_success(self, mock_api):
+    def test_manage_issues_list_success(self, mock_github_api):
         """Test successful issue listing."""
         # Mock successful API response
-        mock_api.get_paginated_results.return_value = [
-            {"number": 1, "title": "Bug report"},
-            {"number": 2, "title": "Feature request"},
-        ]
+        mock_github_api.iter_paginated_results.return_value = _ISSUES_PAYLOAD
 
         result = manage_issues("user/test-repo", "list")
         parsed_result = json.loads(result)
@@ -129,63 +326,286 @@ class TestGitHubTools:
         assert parsed_result[0]["number"] == 1
         assert parsed_result[0]["title"] == "Bug report"
 
-    @patch("grok4git.tools.github_api")
-    def test_manage_issues_create_success(self, mock_api):
+    def test_manage_issues_list_passes_limit(self, mock_github_api):
+        """Test that an issue limit is forwarded so pagination can stop early."""
+        mock_github_api.iter_paginated_results.return_value = _ISSUES_PAYLOAD[:1]
+
+        manage_issues("user/test-repo", "list", limit=1)
+
+        args, kwargs = mock_github_api.iter_paginated_results.call_args
+        assert args[1]["per_page"] == 100
+        assert kwargs["limit"] == 1
+
+    def test_compare_commits_batch_keeps_order_and_isolates_errors(self, mock_github_api):
+        """Test that batched comparisons come back in input order with per-pair errors."""
+        def fake_request(method, url):
+            if url.endswith("/compare/bad...head"):
+                raise GitHubHTTPError("404 Client Error", 404, url)
+            base, head = url.rsplit("/", 1)[1].split("...")
+            return SimpleNamespace(content=json.dumps({
+                "base_commit": {"sha": base, "commit": {"message": "base"}},
+                "head_commit": {"sha": head, "commit": {"message": "head"}},
+                "status": "ahead", "ahead_by": 1, "behind_by": 0, "total_commits": 1,
+                "files": [], "html_url": f"https://github.com/user/test-repo/compare/{base}...{head}",
+            }).encode())
+
+        mock_github_api.make_request.side_effect = fake_request
+
+        result = json.loads(compare_commits_batch("user/test-repo", [
+            {"base_sha": "a1", "head_sha": "b1"},
+            {"base_sha": "bad", "head_sha": "head"},
+            {"base_sha": "a2", "head_sha": "b2"},
+        ]))
+
+        assert [item.get("head_commit", {}).get("sha") for item in result] == ["b1", None, "b2"]
+        assert result[1]["base_sha"] == "bad"
+        assert result[1]["error"] == "404 Client Error"
+
+    def test_compare_commits_batch_reports_malformed_pairs(self, mock_github_api):
+        """Test that non-object pairs become per-pair errors instead of aborting the batch."""
+        result = json.loads(compare_commits_batch("user/test-repo", ["a1...b1", None]))
+
+        assert [set(item) for item in result] == [{"error"}, {"error"}]
+        assert "a1...b1" in result[0]["error"]
+        mock_github_api.make_request.assert_not_called()
+        assert compare_commits_batch("user/test-repo", "a1...b1").startswith("Error:")
+
+    def test_get_commit_details_keeps_selected_fields(self, mock_github_api):
+        """Test that commit details keep only the projected author and file fields."""
+        person = {"name": "Dev", "email": "dev@example.com", "date": "2024-01-01T00:00:00Z", "login": "dev"}
+        mock_github_api.make_request.return_value = SimpleNamespace(content=json.dumps({
+            "sha": "abc123",
+            "commit": {"message": "Fix bug", "author": person, "committer": person},
+            "stats": {"total": 3, "additions": 2, "deletions": 1},
+            "files": [{
+                "filename": "a.py", "status": "modified", "additions": 2, "deletions": 1,
+                "changes": 3, "patch": "@@ -1 +1,2 @@",
+            }],
+            "html_url": "https://github.com/user/test-repo/commit/abc123",
+        }).encode())
+
+        result = json.loads(get_commit_details("user/test-repo", "abc123"))
+
+        assert result["author"] == {"name": "Dev", "email": "dev@example.com", "date": "2024-01-01T00:00:00Z"}
+        assert result["files"] == [
+            {"filename": "a.py", "status": "modified", "additions": 2, "deletions": 1, "changes": 3}
+        ]
+
+    def test_get_commit_diff_truncates_large_diffs(self, mock_github_api):
+        """Test that diffs over the size limit are cut off with a note instead of returned whole."""
+        mock_github_api.make_request.return_value = SimpleNamespace(content=b"+" * (2 * 1024 * 1024 + 10))
+
+        with patch.object(config, "max_file_size_mb", 2):
+            result = get_commit_diff("user/test-repo", "abc123")
+
+        assert result.startswith("+" * 100)
+        assert result.count("+") == 2 * 1024 * 1024
+        assert "diff truncated" in result
+
+    def test_add_issue_comments_posts_in_order(self, mock_github_api):
+        """Test that bulk comments are posted serially and a failure does not stop the rest."""
+        mock_github_api.make_request.side_effect = [Mock(), GitHubHTTPError("404 Client Error", 404, "url"), Mock()]
+
+        result = add_issue_comments("user/test-repo", [
+            {"issue_number": 1, "comment": "a"},
+            {"issue_number": 2, "comment": "b"},
+            {"comment": "no number"},
+            "#3: not an object",
+            {"issue_number": 3, "comment": "c"},
+        ])
+
+        assert [c.kwargs["data"]["body"] for c in mock_github_api.make_request.call_args_list] == ["a", "b", "c"]
+        lines = result.splitlines()
+        assert lines[0] == "Comment added to issue #1 in user/test-repo."
+        assert lines[1].startswith("Error adding comment to issue #2")
+        assert lines[2] == "Error: Comment 3 is missing 'issue_number'"
+        assert lines[3] == "Error: Comment 4 must be an object"
+        assert lines[4] == "Comment added to issue #3 in user/test-repo."
+
+    def test_add_issue_comments_is_offered_to_the_model(self):
+        """Test that the bulk comment tool has a schema requiring both item fields."""
+        schemas = {tool["function"]["name"]: tool["function"] for tool in TOOLS}
+
+        items = schemas["add_issue_comments"]["parameters"]["properties"]["comments"]["items"]
+        assert items["properties"]["issue_number"]["type"] == "integer"
+        assert items["required"] == ["issue_number", "comment"]
+        assert TOOL_FUNCTIONS["add_issue_comments"] is add_issue_comments
+
+    def test_manage_issues_create_success(self, mock_github_api, make_response):
         """Test successful issue creation."""
         # Mock successful API response
-        mock_response = Mock()
-        mock_response.json.return_value = {"html_url": "https://github.com/user/test-repo/issues/3"}
-        mock_api.make_request.return_value = mock_response
-
-        result = manage_issues("user/test-repo", "create", "Test Issue", "Test body")
-
-        assert result == "https://github.com/user/test-repo/issues/3"
-
-    def test_create_pull_request_empty_files(self):
-        """Test create_pull_request with empty files list."""
-        result = create_pull_request(
-            "user/test-repo", "Test PR", "Test description", "test-branch", [], "Test commit"
-        )
-
-        assert "Error" in result
-        assert "non-empty list" in result
+        mock_response = make_response({"html_url": "https://github.com/user/test-repo/issues/3"})
+        mock_github_api.make_request.return_value = mock_response
 
-    def test_manage_issues_invalid_action(self):
-        """Test manage_issues with invalid action."""
-        result = manage_issues("user/test-repo", "invalid_action")
+        _repo_bundle_cache["user/test-repo"] = (float("inf"), {"issues": {"totalCount": 2}})
 
-        assert "Error" in result
-        assert "Invalid action" in result
-
-    def test_manage_issues_create_no_title(self):
-        """Test manage_issues create without title."""
-        result = manage_issues("user/test-repo", "create")
-
-        assert "Error" in result
-        assert "Title required" in result
-
-
-class TestErrorHandling:
-    """Test error handling in GitHub tools."""
+        result = manage_issues("user/test-repo", "create", "Test Issue", "Test body")
 
-    @patch("grok4git.tools.github_api")
-    def test_api_error_handling(self, mock_api):
-        """Test API error handling."""
-        mock_api.get_paginated_results.side_effect = Exception("API Error")
+        # The cached open issue count is stale once the issue exists
+        assert "user/test-repo" not in _repo_bundle_cache
 
-        result = list_github_repos()
+        assert result == "https://github.com/user/test-repo/issues/3"
 
-        assert "Error" in result
-        assert "API Error" in result
+    def test_create_pull_request_overlaps_permission_and_ref_lookups(self, mock_github_api, make_response):
+        """Test that the base ref is fetched while repository permissions are checked."""
+        import threading
+
+        ref_started = threading.Event()
+        responses = {
+            "/repos/user/test-repo": {"permissions": {"push": True}, "default_branch": "main"},
+            "/git/ref/heads/develop": {"object": {"sha": "base"}},
+            "/git/commits/base": {"tree": {"sha": "tree"}},
+            "/git/trees": {"sha": "new-tree"},
+            "/git/commits": {"sha": "new-commit"},
+            "/git/refs": {},
+            "/pulls": {"html_url": "https://github.com/user/test-repo/pull/1"},
+        }
 
-    @patch("grok4git.tools.github_api")
-    def test_404_error_handling(self, mock_api):
-        """Test 404 error handling."""
-        mock_api.make_request.side_effect = Exception("404 Not Found")
+        def fake_request(method, url, data=None, params=None):
+            if url.endswith("/git/ref/heads/develop"):
+                ref_started.set()
+            elif url.endswith("/repos/user/test-repo"):
+                # The permission check only returns once the ref lookup is in flight
+                assert ref_started.wait(timeout=5)
+            return make_response(next(
+                body for suffix, body in responses.items() if url.endswith(suffix)
+            ))
+
+        mock_github_api.make_request.side_effect = fake_request
+        files = [{"file_path": "a.py", "new_content": "x = 1\n"}]
+
+        with patch.object(config, "pr_preflight_permission_check", True):
+            result = create_pull_request(
+                "user/test-repo", "Test PR", "Body", "feature", files,
+                "Add a.py", base_branch="develop", enable_peer_review=False,
+            )
+
+        assert result == "https://github.com/user/test-repo/pull/1"
+        mock_github_api.get_default_branch.assert_not_called()
+
+        # Without the opt-in pre-flight check the repository metadata is never fetched
+        mock_github_api.make_request.reset_mock()
+        ref_started.set()
+        create_pull_request(
+            "user/test-repo", "Test PR", "Body", "feature", files,
+            "Add a.py", base_branch="develop", enable_peer_review=False,
+        )
+        urls = [c.args[1] for c in mock_github_api.make_request.call_args_list]
+        assert not any(url.endswith("/repos/user/test-repo") for url in urls)
+
+    def test_iterate_pull_request_continues_peer_review(self, mock_github_api, monkeypatch):
+        """Test that a follow-up iteration reuses the reviewer and only sends what changed."""
+        monkeypatch.setattr("grok4git.tools._peer_review_sessions", {})
+        review = json.dumps(
+            {"decision": "request_changes", "feedback": "Add tests", "suggestions": []}
+        )
+        message = SimpleNamespace(content=review, tool_calls=None)
+        client = Mock()
+        client.chat.completions.create.return_value = SimpleNamespace(
+            choices=[SimpleNamespace(message=message)]
+        )
+        args = ("user/test-repo", "Add a", "Adds a", "feature-1")
+
+        with patch("openai.OpenAI", return_value=client) as openai_class:
+            first = create_pull_request(
+                *args, [{"file_path": "a.py", "new_content": "a = 1\n"}], "Add a",
+                enable_peer_review=True,
+            )
+            second = iterate_pull_request(
+                *args[:3], [{"file_path": "a.py", "new_content": "a = 2\n"}], "Add a", "feature-2",
+            )
+
+        assert first.startswith("Peer review feedback (iteration 1)")
+        assert second.startswith("Peer review feedback (iteration 2)")
+        openai_class.assert_called_once()
+        messages = client.chat.completions.create.call_args.kwargs["messages"]
+        follow_up = [m["content"] for m in messages if m["role"] == "user"][-1]
+        assert "**Branch:** feature-2 → main" in follow_up
+        assert "-a = 1\n+a = 2" in follow_up
+        assert "**Files Changed:**" not in follow_up
+        mock_github_api.make_request.assert_not_called()
+
+    @pytest.mark.parametrize(
+        "decision,max_iterations",
+        [("needs_major_revision", 3), ("request_changes", 1)],
+    )
+    def test_final_review_decision_ends_the_session(
+        self, mock_github_api, monkeypatch, decision, max_iterations
+    ):
+        """Test that a review that reached a final decision is not continued on the next PR."""
+        sessions = {}
+        monkeypatch.setattr("grok4git.tools._peer_review_sessions", sessions)
+        monkeypatch.setattr(config, "max_review_iterations", max_iterations)
+        review = json.dumps({"decision": decision, "feedback": "Rework", "suggestions": []})
+        message = SimpleNamespace(content=review, tool_calls=None)
+        client = Mock()
+        client.chat.completions.create.return_value = SimpleNamespace(
+            choices=[SimpleNamespace(message=message)]
+        )
 
-        result = get_repo_info("user/nonexistent-repo")
+        with patch("openai.OpenAI", return_value=client), patch(
+            "grok4git.peer_review.PeerReviewOrchestrator._ask_user_for_final_decision",
+            return_value=False,
+        ):
+            result = create_pull_request(
+                "user/test-repo", "Add a", "Adds a", "feature-1",
+                [{"file_path": "a.py", "new_content": "a = 1\n"}], "Add a",
+                enable_peer_review=True,
+            )
+
+        assert "Rework" in result
+        assert sessions == {}
+        mock_github_api.make_request.assert_not_called()
+
+    def test_create_pull_request_skips_unchanged_files(self, mock_github_api, make_response):
+        """Test that a PR whose files all match the base tree stops before any writes."""
+        responses = {
+            "/git/ref/heads/main": {"object": {"sha": "base"}},
+            "/git/commits/base": {"tree": {"sha": "tree"}},
+            # Git blob SHA of "x = 1\n"
+            "/git/trees/tree": {"tree": [{"path": "a.py", "type": "blob", "sha": "7d4290a117a4ddcc11daae7ea675841033830c8f"}]},
+        }
 
-        assert "Error" in result
+        def fake_request(method, url, data=None, params=None):
+            return make_response(next(body for suffix, body in responses.items() if url.endswith(suffix)))
+
+        mock_github_api.make_request.side_effect = fake_request
+
+        # Without the opt-in pre-flight check there is nothing to overlap, so no thread pool
+        with patch("grok4git.tools.ThreadPoolExecutor") as mock_executor:
+            result = create_pull_request(
+                "user/test-repo", "Test PR", "Body", "feature",
+                [{"file_path": "a.py", "new_content": "x = 1\n"}],
+                "Add a.py", base_branch="main", enable_peer_review=False,
+            )
+
+        mock_executor.assert_not_called()
+        assert result.startswith("No changes to submit")
+        assert [c.args[0] for c in mock_github_api.make_request.call_args_list] == ["GET", "GET", "GET"]
+
+    @pytest.mark.parametrize(
+        "tool_function,args,expected",
+        [
+            (
+                create_pull_request,
+                ("user/test-repo", "Test PR", "Test description", "test-branch", [], "Test commit"),
+                "Error: 'files' must be a non-empty list",
+            ),
+            (
+                manage_issues,
+                ("user/test-repo", "invalid_action"),
+                "Error: Invalid action 'invalid_action'. Use 'list' or 'create'",
+            ),
+            (
+                manage_issues,
+                ("user/test-repo", "create"),
+                "Error: Title required for creating an issue",
+            ),
+        ],
+    )
+    def test_argument_validation_errors(self, tool_function, args, expected):
+        """Test that invalid arguments are rejected before any API call."""
+        assert tool_function(*args) == expected
 
 
 if __name__ == "__main__":
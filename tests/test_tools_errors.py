@@ -0,0 +1,50 @@
+"""
+Unit tests for error handling in the tools module.
+"""
+
+import pytest
+from grok4git.github_api import GitHubHTTPError
+from grok4git.tools import delete_file, get_repo_info, list_github_repos
+
+pytestmark = pytest.mark.usefixtures("clear_repo_caches")
+
+
+class TestErrorHandling:
+    """Test error handling in GitHub tools."""
+
+    def test_api_error_handling(self, mock_github_api):
+        """Test API error handling."""
+        mock_github_api.iter_paginated_results.side_effect = Exception("API Error")
+
+        assert list_github_repos() == "Error listing repositories: API Error"
+
+    def test_404_error_handling(self, mock_github_api):
+        """Test 404 error handling."""
+        mock_github_api.make_request.side_effect = Exception("404 Not Found")
+
+        result = get_repo_info("user/nonexistent-repo")
+
+        assert result == "Error getting repository info: 404 Not Found"
+
+    def test_status_code_drives_error_messages(self, mock_github_api):
+        """Test that error branches use the HTTP status, not digits in the message."""
+        mock_github_api.make_request.side_effect = GitHubHTTPError(
+            "404 Client Error: Not Found",
+            404,
+            "https://api.github.com/repos/user/test-repo/contents/a.py",
+        )
+        result = delete_file("user/test-repo", "a.py", branch="main")
+        assert result == (
+            "Error: File 'a.py' not found in repository 'user/test-repo' on branch 'main'"
+        )
+
+        # A 500 whose URL happens to contain "404" is not mistaken for a missing file
+        mock_github_api.make_request.side_effect = GitHubHTTPError(
+            "500 Server Error", 500, "https://api.github.com/repos/user/test-repo/contents/404.html"
+        )
+        result = delete_file("user/test-repo", "404.html", branch="main")
+        assert result.startswith("Error deleting file: 500 Server Error")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])